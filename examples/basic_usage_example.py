@@ -2,23 +2,39 @@
 
 """Basic usage example for the xderived plugin."""
 
+# Requires xderived to be installed, e.g. `pip install -e .` from the repository root.
+
 import xarray as xr
 import numpy as np
-import sys
-import os
-
-# Add the parent directory of xderived to the Python path
-# This allows importing xderived when running the script from the examples directory
-script_dir = os.path.dirname(os.path.abspath(__file__))
-project_root = os.path.dirname(script_dir) # This should be xderived_project/
-sys.path.insert(0, project_root)
 
 import xderived # This will register the accessor and standard variables
 from xderived.core import DerivedVariable, registry
 from xderived.utils import MissingDependencyError
 
+try:
+    from numba import njit, prange
+except ImportError: # numba is optional; the example falls back to plain NumPy
+    njit = None
+
+if njit is not None:
+    @njit(parallel=True, fastmath=True, cache=True)
+    def _k2c(a, out):
+        # Single fused pass over the data, parallelized across cores with prange
+        for i in prange(a.size):
+            out[i] = a[i] - 273.15
+
+def _kelvin_to_celsius_values(values: np.ndarray) -> np.ndarray:
+    """Elementwise K -> degC on a NumPy block (uses the numba kernel when available)."""
+    if njit is None:
+        return values - 273.15
+    values = np.ascontiguousarray(values)
+    out = np.empty_like(values)
+    _k2c(values.reshape(-1), out.reshape(-1))
+    return out
+
 def main():
     print("--- xderived Plugin: Basic Usage Example ---")
+    rng = np.random.default_rng(0) # Deterministic, so the fallback dataset is reproducible
 
     # 1. Load a sample dataset
     print("\n1. Loading sample dataset (eraint_uvz)...")
@@ -29,10 +45,10 @@ def main():
         print("Attempting to create a minimal dummy dataset for demonstration.")
         ds = xr.Dataset(
             {
-                "air_temperature": (("level", "latitude", "longitude"), np.random.rand(2, 3, 4) * 30 + 273.15),
-                "air_pressure": (("level", "latitude", "longitude"), (np.arange(1000, 500, -250)[:, np.newaxis, np.newaxis] + np.random.rand(2,3,4)*10) * 100),
-                "eastward_wind": (("level", "latitude", "longitude"), np.random.rand(2, 3, 4) * 20 - 10),
-                "northward_wind": (("level", "latitude", "longitude"), np.random.rand(2, 3, 4) * 20 - 10),
+                "air_temperature": (("level", "latitude", "longitude"), rng.random((2, 3, 4), dtype=np.float32) * 30 + 273.15),
+                "air_pressure": (("level", "latitude", "longitude"), (np.arange(1000, 500, -250, dtype=np.float32)[:, np.newaxis, np.newaxis] + rng.random((2, 3, 4), dtype=np.float32) * 10) * 100),
+                "eastward_wind": (("level", "latitude", "longitude"), rng.random((2, 3, 4), dtype=np.float32) * 20 - 10),
+                "northward_wind": (("level", "latitude", "longitude"), rng.random((2, 3, 4), dtype=np.float32) * 20 - 10),
             },
             coords={
                 "level": [750, 850],
@@ -141,12 +157,15 @@ def main():
 
     def kelvin_to_celsius(ds_custom: xr.Dataset) -> xr.DataArray:
         temp_k = ds_custom["air_temperature"]
-        temp_c = temp_k - 273.15
-        temp_c.attrs = temp_k.attrs.copy()
-        temp_c.attrs["units"] = "Celsius"
-        temp_c.attrs["long_name"] = "Air Temperature in Celsius"
-        temp_c.name = "air_temperature_celsius" # Important for the DataArray itself
-        return temp_c
+        # apply_ufunc keeps dims/coords and runs the kernel per chunk for Dask-backed inputs
+        temp_c = xr.apply_ufunc(
+            _kelvin_to_celsius_values, temp_k,
+            dask="parallelized", output_dtypes=[temp_k.dtype]
+        )
+        # One merged attrs dict; the name is important for the DataArray itself
+        return temp_c.rename("air_temperature_celsius").assign_attrs(
+            {**temp_k.attrs, "units": "Celsius", "long_name": "Air Temperature in Celsius"}
+        )
 
     temp_c_var = DerivedVariable(
         name="air_temperature_celsius",
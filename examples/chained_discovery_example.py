@@ -2,15 +2,13 @@
 
 """Example script demonstrating chained derived variable computations and discovery features for the xderived plugin."""
 
-import xarray as xr
-import numpy as np
-import os
+# Requires xderived to be installed, e.g. `pip install -e .` from the repository root.
+
+import json
 import sys
 
-# Add project root to sys.path to allow importing xderived
-script_dir = os.path.dirname(os.path.abspath(__file__))
-project_root = os.path.dirname(script_dir) # This should be xderived_project/
-sys.path.insert(0, project_root)
+import xarray as xr
+import numpy as np
 
 import xderived # This import registers the accessor and standard variables
 from xderived.core import registry, DerivedVariable, RegistrationError # For direct interaction if needed
@@ -42,22 +40,23 @@ if __name__ == "__main__":
     print("--- xderived Plugin: Chained Discovery Example ---")
     print("--- Creating Sample Dataset ---")
     ds = create_sample_dataset_for_chaining()
+    derived = ds.derived # Bound once; xarray reuses this accessor for ds
     print(ds)
     print("\n")
 
     print("--- Accessor Representation (shows computability) ---")
-    print(ds.derived)
+    print(derived)
     print("\n")
 
     print("--- Discovery: List Computable Variables ---")
-    computable_vars = ds.derived.list_computable()
+    computable_vars = derived.list_computable()
     print(f"Computable derived variables: {computable_vars}")
     assert "relative_humidity_from_mixing_ratios" in computable_vars
     assert "equivalent_potential_temperature_approx" in computable_vars
     print("\n")
 
     print("--- Discovery: Get Metadata for a Variable (e.g., relative_humidity_from_mixing_ratios) ---")
-    rh_metadata = ds.derived.get_metadata("relative_humidity_from_mixing_ratios")
+    rh_metadata = derived.get_metadata("relative_humidity_from_mixing_ratios")
     if rh_metadata:
         print(f"Metadata for relative_humidity_from_mixing_ratios:")
         for key, value in rh_metadata.items():
@@ -67,27 +66,28 @@ if __name__ == "__main__":
     print("\n")
 
     print("--- Discovery: Get Dependencies (e.g., relative_humidity_from_mixing_ratios, recursive) ---")
-    rh_deps_recursive = ds.derived.get_dependencies("relative_humidity_from_mixing_ratios", recursive=True)
+    rh_deps_recursive = derived.get_dependencies("relative_humidity_from_mixing_ratios", recursive=True)
     print(f"Recursive dependencies for relative_humidity_from_mixing_ratios:")
-    import json
-    print(json.dumps(rh_deps_recursive, indent=2))
+    json.dump(rh_deps_recursive, sys.stdout, indent=2) # Streams instead of building the whole string
+    sys.stdout.write("\n")
     print("\n")
     
     print("--- Discovery: Get Dependencies (e.g., equivalent_potential_temperature_approx, recursive) ---")
-    theta_e_deps_recursive = ds.derived.get_dependencies("equivalent_potential_temperature_approx", recursive=True)
+    theta_e_deps_recursive = derived.get_dependencies("equivalent_potential_temperature_approx", recursive=True)
     print(f"Recursive dependencies for equivalent_potential_temperature_approx:")
-    print(json.dumps(theta_e_deps_recursive, indent=2))
+    json.dump(theta_e_deps_recursive, sys.stdout, indent=2)
+    sys.stdout.write("\n")
     print("\n")
 
     print("--- Discovery: Search Variables (keyword: 'humidity') ---")
-    humidity_search = ds.derived.search_variables("humidity")
+    humidity_search = derived.search_variables("humidity")
     print(f"Search results for 'humidity':")
     for item in humidity_search:
         print(f"  - Name: {item.get('name')}, Description: {item.get('description')}")
     print("\n")
     
     print("--- Discovery: Search Variables (keyword: 'potential') ---")
-    potential_search = ds.derived.search_variables("potential")
+    potential_search = derived.search_variables("potential")
     print(f"Search results for 'potential':")
     for item in potential_search:
         print(f"  - Name: {item.get('name')}, Description: {item.get('description')}")
@@ -95,7 +95,7 @@ if __name__ == "__main__":
 
     print("--- Computation: Chained Derived Variable (Relative Humidity) ---")
     try:
-        rh = ds.derived.relative_humidity_from_mixing_ratios
+        rh = derived.relative_humidity_from_mixing_ratios
         print("Computed Relative Humidity (from mixing ratios):")
         print(rh)
         print(f"Units: {rh.attrs.get('units')}")
@@ -106,7 +106,7 @@ if __name__ == "__main__":
 
     print("--- Computation: Chained Derived Variable (Equivalent Potential Temperature Approx) ---")
     try:
-        theta_e = ds.derived.equivalent_potential_temperature_approx
+        theta_e = derived.equivalent_potential_temperature_approx
         print("Computed Equivalent Potential Temperature (Approximate):")
         print(theta_e)
         print(f"Units: {theta_e.attrs.get('units')}")
@@ -138,17 +138,19 @@ if __name__ == "__main__":
     def func_a(ds_input): return ds_input["cycle_var_b"]
     def func_b(ds_input): return ds_input["cycle_var_a"]
     
-    registry.register(DerivedVariable(name="cycle_var_a", dependencies=["cycle_var_b"], func=func_a, description="Cycle A"))
-    registry.register(DerivedVariable(name="cycle_var_b", dependencies=["cycle_var_a"], func=func_b, description="Cycle B"))
+    registry.register_many([
+        DerivedVariable(name="cycle_var_a", dependencies=["cycle_var_b"], func=func_a, description="Cycle A"),
+        DerivedVariable(name="cycle_var_b", dependencies=["cycle_var_a"], func=func_b, description="Cycle B"),
+    ])
     
     print("Accessor repr with cyclic variables registered:")
-    print(ds.derived) # Should show them as unavailable due to cycle
+    print(derived) # Should show them as unavailable due to cycle
     # Using internal _is_computable for direct check, normally use get_status
     print(f"Is cycle_var_a computable (direct check)? {registry._is_computable('cycle_var_a', ds, resolving_stack=set())}") 
 
     try:
         print("Attempting to compute cycle_var_a...")
-        _ = ds.derived.cycle_var_a
+        _ = derived.cycle_var_a
     except Exception as e:
         print(f"Successfully caught error for cycle_var_a: {e}")
         assert "Circular dependency detected" in str(e)
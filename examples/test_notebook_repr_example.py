@@ -6,9 +6,9 @@ import xarray as xr
 import numpy as np
 import dask.array as da
 
-# Ensure the plugin is imported and patches are applied
-import xarray_derived # This should apply the patch
-from xarray_derived import registry, DerivedVariable, config
+# Requires xderived to be installed, e.g. `pip install -e .` from the repository root.
+import xderived # Registers the .derived accessor and standard variables
+from xderived import registry, DerivedVariable, config
 
 def main():
     print("--- Testing Notebook HTML Representation for Derived Variables ---")
@@ -68,13 +68,14 @@ def main():
             "lon": [10, 20]
         }
     )
+    derived_numpy = ds_numpy.derived # xarray caches the accessor per Dataset; bind it once
     print("Dataset created. Generating HTML repr...")
     html_output_numpy = ds_numpy._repr_html_()
     print("\nHTML Output (NumPy ds, show_computable_only=False - default):")
     print(html_output_numpy)
     # Check if derived variables are computed (they should not be in cache yet)
-    print(f"Cache after NumPy HTML repr: {ds_numpy.derived._cache}")
-    assert not ds_numpy.derived._cache, "Cache should be empty after HTML repr generation for NumPy ds"
+    print(f"Cache after NumPy HTML repr: {derived_numpy._cache}")
+    assert not derived_numpy._cache, "Cache should be empty after HTML repr generation for NumPy ds"
 
     # Test with config option
     config.config["repr_show_computable_only"] = True
@@ -82,8 +83,8 @@ def main():
     html_output_numpy_computable_only = ds_numpy._repr_html_()
     print(html_output_numpy_computable_only)
     config.config["repr_show_computable_only"] = False # Reset config
-    print(f"Cache after NumPy HTML repr (computable_only=True): {ds_numpy.derived._cache}")
-    assert not ds_numpy.derived._cache, "Cache should be empty after HTML repr generation for NumPy ds (computable_only=True)"
+    print(f"Cache after NumPy HTML repr (computable_only=True): {derived_numpy._cache}")
+    assert not derived_numpy._cache, "Cache should be empty after HTML repr generation for NumPy ds (computable_only=True)"
 
 
     # --- Test Case 2: Lazy (Dask-backed) Dataset ---
@@ -97,12 +98,13 @@ def main():
             "lon": [10, 20]
         }
     )
+    derived_dask = ds_dask.derived
     print("Dask Dataset created. Generating HTML repr...")
     html_output_dask = ds_dask._repr_html_()
     print("\nHTML Output (Dask ds, show_computable_only=False - default):")
     print(html_output_dask)
-    print(f"Cache after Dask HTML repr: {ds_dask.derived._cache}")
-    assert not ds_dask.derived._cache, "Cache should be empty after HTML repr generation for Dask ds"
+    print(f"Cache after Dask HTML repr: {derived_dask._cache}")
+    assert not derived_dask._cache, "Cache should be empty after HTML repr generation for Dask ds"
 
     # Test with config option for Dask
     config.config["repr_show_computable_only"] = True
@@ -110,20 +112,20 @@ def main():
     html_output_dask_computable_only = ds_dask._repr_html_()
     print(html_output_dask_computable_only)
     config.config["repr_show_computable_only"] = False # Reset config
-    print(f"Cache after Dask HTML repr (computable_only=True): {ds_dask.derived._cache}")
-    assert not ds_dask.derived._cache, "Cache should be empty after HTML repr generation for Dask ds (computable_only=True)"
+    print(f"Cache after Dask HTML repr (computable_only=True): {derived_dask._cache}")
+    assert not derived_dask._cache, "Cache should be empty after HTML repr generation for Dask ds (computable_only=True)"
 
     # --- Test Case 3: Accessing a derived variable to see if it computes ---
     print("\n\n--- Test Case 3: Accessing a derived variable ---")
     print("Accessing ds_dask.derived.temp_kelvin_plus_10...")
-    computed_var = ds_dask.derived.temp_kelvin_plus_10
+    computed_var = derived_dask.temp_kelvin_plus_10
     print(f"Computed var:\n{computed_var}")
-    assert "temp_kelvin_plus_10" in ds_dask.derived._cache, "temp_kelvin_plus_10 should be in cache after access"
+    assert "temp_kelvin_plus_10" in derived_dask._cache, "temp_kelvin_plus_10 should be in cache after access"
     assert isinstance(computed_var.data, da.Array), "Computed variable from Dask input should be Dask array"
     print("Accessing ds_dask.derived.temp_kelvin_plus_20 (chained)...")
-    computed_var_chained = ds_dask.derived.temp_kelvin_plus_20
+    computed_var_chained = derived_dask.temp_kelvin_plus_20
     print(f"Computed chained var:\n{computed_var_chained}")
-    assert "temp_kelvin_plus_20" in ds_dask.derived._cache, "temp_kelvin_plus_20 should be in cache after access"
+    assert "temp_kelvin_plus_20" in derived_dask._cache, "temp_kelvin_plus_20 should be in cache after access"
     assert isinstance(computed_var_chained.data, da.Array), "Chained computed variable from Dask input should be Dask array"
 
     print("\n\n--- Test completed. Review the HTML output above. ---")
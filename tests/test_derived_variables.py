@@ -3,17 +3,22 @@
 import pytest
 import xarray as xr
 import numpy as np
-import os
 import sys
+import copy
+import pickle
+import importlib.util
+import warnings
 import re # For escaping regex special characters if needed
+from pathlib import Path
 
-# Add project root to sys.path to allow importing xderived
-script_dir = os.path.dirname(os.path.abspath(__file__))
-project_root = os.path.dirname(script_dir) # This should be xderived_project/
-sys.path.insert(0, project_root)
+# Add project root to sys.path so the tests also run without an editable install
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
 
 from xderived.core import DerivedVariable, registry, DerivedVariableRegistry
 from xderived.utils import MissingDependencyError, ComputationError, RegistrationError
+from xderived import accessor as accessor_module
 import xderived # This import registers the accessor and standard variables
 
 # --- Fixtures for test data ---
@@ -64,6 +69,20 @@ def test_derived_variable_creation():
     assert dv.dependencies == ["air_temperature"]
     assert dv.description == "A test var"
     assert dv.attrs == {"units": "K"}
+    assert not hasattr(dv, "__dict__") # Slotted
+
+def test_definition_attrs_are_copied(sample_dataset_base):
+    def dummy_func(ds): return ds["air_temperature"].copy()
+    attrs = {"units": "K"}
+    registry.register(DerivedVariable("frozen_attrs_var", ["air_temperature"], dummy_func, attrs=attrs, long_name="Frozen"))
+    assert attrs == {"units": "K"} # Caller's dict is not filled in with defaults
+    result = sample_dataset_base.derived.frozen_attrs_var
+    result.attrs["units"] = "degC" # Results get their own mutable copy
+    assert registry.get_variable("frozen_attrs_var").attrs["units"] == "K"
+    registry.get_variable("frozen_attrs_var").attrs["comment"] = "edited" # Definitions stay editable
+    assert sample_dataset_base.copy(deep=True).derived.frozen_attrs_var.attrs["comment"] == "edited"
+    pt_def = copy.deepcopy(pickle.loads(pickle.dumps(registry.get_variable("potential_temperature"))))
+    assert pt_def.attrs == registry.get_variable("potential_temperature").attrs
 
 def test_registry_singleton():
     reg1 = DerivedVariableRegistry()
@@ -71,6 +90,35 @@ def test_registry_singleton():
     assert reg1 is reg2
     assert registry is reg1 # Global instance
 
+def test_register_standard_variables_is_idempotent():
+    count, version = len(registry.list_all()), registry._version
+    xderived.standard_variables.register_standard_variables() # Already registered by the fixture
+    assert len(registry.list_all()) == count
+    assert registry._version == version # Nothing re-registered, so caches stay valid
+    assert "potential_temperature" in registry and "not_a_registered_var" not in registry
+
+def test_import_does_not_load_dask():
+    import subprocess
+    code = "import sys, xderived; print('dask.array' in sys.modules)"
+    result = subprocess.run([sys.executable, "-c", code], cwd=PROJECT_ROOT, capture_output=True, text=True, check=True)
+    assert result.stdout.strip() == "False"
+
+def test_expr_variable(sample_dataset_base, dask_dataset):
+    expr_var = DerivedVariable(
+        name="theta_from_expr",
+        dependencies=["air_temperature", "air_pressure"],
+        func=None,
+        expr="air_temperature * (100000.0 / air_pressure)**(287.058 / 1005.0)",
+    )
+    registry.register(expr_var)
+    theta = sample_dataset_base.derived.theta_from_expr
+    np.testing.assert_allclose(theta.values, sample_dataset_base.derived.potential_temperature.values, rtol=1e-5)
+    assert theta.dtype == np.float32
+    assert hasattr(dask_dataset.derived.theta_from_expr.data, "dask")
+    assert sample_dataset_base.astype("float64").derived.theta_from_expr.dtype == np.float64 # per-dtype program
+    with pytest.raises(ValueError, match="func must be a callable"):
+        DerivedVariable("no_func_or_expr", ["air_temperature"], None)
+
 def test_register_and_get_variable():
     def dummy_func(ds): return ds["air_temperature"]
     dv = DerivedVariable("custom_temp", ["air_temperature"], dummy_func)
@@ -89,6 +137,30 @@ def test_register_duplicate_error():
     with pytest.raises(RegistrationError, match=re.escape(expected_message)):
         registry.register(dv2)
 
+def test_register_replace_ok():
+    def dummy_func(ds): return ds["air_temperature"]
+    registry.register(DerivedVariable("replace_ok_var", ["air_temperature"], dummy_func))
+    version = registry._version
+    registry.register(DerivedVariable("replace_ok_var", ["air_temperature"], dummy_func), replace_ok=True)
+    assert registry._version == version # Identical definition: caches stay valid
+    replacement = DerivedVariable("replace_ok_var", ["air_pressure"], dummy_func)
+    registry.register(replacement, replace_ok=True)
+    assert registry._version == version + 1
+    assert registry.get_variable("replace_ok_var") is replacement
+    assert registry.transitive_dependencies("replace_ok_var") == {"air_pressure"}
+
+def test_register_many():
+    def dummy_func(ds): return ds["air_temperature"]
+    version = registry._version
+    registry.register_many([DerivedVariable("batch_a", ["air_temperature"], dummy_func),
+                            DerivedVariable("batch_b", ["batch_a"], dummy_func)])
+    assert registry.get_variable("batch_a") is not None and registry.get_variable("batch_b") is not None
+    assert registry._version == version + 1
+    with pytest.raises(RegistrationError, match=re.escape("DerivedVariable with name \"batch_c\" is already registered.")):
+        registry.register_many([DerivedVariable("batch_c", ["air_temperature"], dummy_func),
+                                DerivedVariable("batch_c", ["air_pressure"], dummy_func)])
+    assert registry.get_variable("batch_c") is None # A failed batch registers nothing
+
 def test_unregister_variable():
     def dummy_func(ds): return ds["air_temperature"]
     dv = DerivedVariable("to_unregister", ["air_temperature"], dummy_func)
@@ -115,13 +187,64 @@ def test_check_availability(sample_dataset_base):
     assert "potential_temperature" not in available_missing
     assert "wind_speed" in available_missing
 
+def test_availability_cache_invalidated_on_register(sample_dataset_base):
+    def dummy_func(ds): return ds["air_temperature"]
+    assert "late_registered_var" not in sample_dataset_base.derived.list_computable()
+    registry.register(DerivedVariable("late_registered_var", ["potential_temperature"], dummy_func))
+    assert "late_registered_var" in sample_dataset_base.derived.list_computable()
+    registry.unregister("potential_temperature")
+    assert "late_registered_var" not in sample_dataset_base.derived.list_computable()
+
+def test_transitive_dependencies():
+    assert registry.transitive_dependencies("relative_humidity_from_mixing_ratios") == {
+        "mixing_ratio_from_specific_humidity", "saturation_mixing_ratio", "saturation_vapor_pressure_tetens",
+        "specific_humidity", "air_pressure", "air_temperature",
+    }
+    assert not registry.in_cycle("relative_humidity_from_mixing_ratios")
+    with pytest.raises(RegistrationError):
+        registry.transitive_dependencies("not_a_registered_var")
+
+def test_recursive_dependencies_share_diamond_subtrees(sample_dataset_base):
+    def dummy_func(ds): return ds["air_temperature"]
+    registry.register_many([DerivedVariable("diamond_bottom", ["air_temperature"], dummy_func),
+                            DerivedVariable("diamond_left", ["diamond_bottom"], dummy_func),
+                            DerivedVariable("diamond_right", ["diamond_bottom", "air_pressure"], dummy_func),
+                            DerivedVariable("diamond_top", ["diamond_left", "diamond_right"], dummy_func)])
+    report = registry.get_dependencies("diamond_top", recursive=True, ds=sample_dataset_base)
+    left = report["dependencies"]["diamond_left"]["dependencies"]["dependencies"]["diamond_bottom"]
+    right = report["dependencies"]["diamond_right"]["dependencies"]["dependencies"]["diamond_bottom"]
+    assert left == right == {"status": "derived_variable", "dependencies": {
+        "name": "diamond_bottom", "description": "diamond_bottom",
+        "dependencies": {"air_temperature": {"status": "base_variable_in_dataset"}}}}
+    assert left["dependencies"] is right["dependencies"] # Built once per call
+
+def test_cycle_broken_by_dataset_variable(sample_dataset_base):
+    def first_dep(ds): return ds[list(ds.data_vars)[0]]
+    registry.register_many([
+        DerivedVariable("kahn_cycle_a", ["kahn_cycle_b"], first_dep),
+        DerivedVariable("kahn_cycle_b", ["kahn_cycle_a"], first_dep),
+        DerivedVariable("kahn_cycle_c", ["kahn_cycle_a"], first_dep),
+    ])
+    assert not {"kahn_cycle_a", "kahn_cycle_b", "kahn_cycle_c"} & registry.computable_set(sample_dataset_base)
+    ds = sample_dataset_base.assign(kahn_cycle_b=sample_dataset_base["air_temperature"])
+    assert {"kahn_cycle_a", "kahn_cycle_b", "kahn_cycle_c"} <= registry.computable_set(ds)
+    assert ds.derived.get_status("kahn_cycle_c")["computable"]
+
 # --- Tests for Accessor ---
 
+def test_accessor_is_reused_per_dataset(sample_dataset_base):
+    derived = sample_dataset_base.derived
+    assert sample_dataset_base.derived is derived # so its _cache survives repeated attribute access
+    derived.potential_temperature
+    assert "potential_temperature" in sample_dataset_base.derived._cache
+
 def test_accessor_repr(sample_dataset_base):
     repr_str = repr(sample_dataset_base.derived)
     assert "xderived Accessor" in repr_str # Updated name
     assert "potential_temperature: Air Potential Temperature" in repr_str
     assert "(computable)" in repr_str # Updated status string
+    assert repr(sample_dataset_base.copy().derived) is repr_str # Memoized per variable names and registry version
+    assert repr(sample_dataset_base[["air_temperature"]].derived).count("'lat'") == 1 # Coords listed once
     
     def dummy_func_needs_foo(ds): return ds["foo"]
     needs_foo_var_name = "needs_foo_for_repr_test"
@@ -135,12 +258,23 @@ def test_accessor_repr(sample_dataset_base):
     if registry.get_variable(needs_foo_var_name) is not None:
          registry.unregister(needs_foo_var_name)
 
+def test_accessor_repr_html_memoized(sample_dataset_base):
+    html1 = sample_dataset_base.derived._repr_html_()
+    html2 = sample_dataset_base.copy().derived._repr_html_()
+    assert html1 is html2 # Same schema and registry version share the rendered HTML
+    def dummy_func(ds): return ds["air_temperature"]
+    registry.register(DerivedVariable("registered_after_html", ["air_temperature"], dummy_func))
+    html3 = sample_dataset_base.derived._repr_html_()
+    assert "registered_after_html" in html3
+
 def test_accessor_dir(sample_dataset_base):
     dir_list = dir(sample_dataset_base.derived)
     assert "potential_temperature" in dir_list
     assert "wind_speed" in dir_list
     assert "available_variables" in dir_list # Method from accessor
     assert "list_computable" in dir_list # Method from accessor
+    registry.register(DerivedVariable("dir_listed_later", ["air_temperature"], lambda ds: ds["air_temperature"]))
+    assert "dir_listed_later" in dir(sample_dataset_base.derived) # cached listing follows the registry
 
 def test_accessor_getattr_and_getitem(sample_dataset_base):
     pt = sample_dataset_base.derived.potential_temperature
@@ -150,6 +284,15 @@ def test_accessor_getattr_and_getitem(sample_dataset_base):
     assert isinstance(pt_item, xr.DataArray)
     xr.testing.assert_identical(pt, pt_item)
 
+def test_accessor_private_names_skip_registry(sample_dataset_base, monkeypatch):
+    def dummy_func(ds): return ds["air_temperature"]
+    registry.register(DerivedVariable("_private_var", ["air_temperature"], dummy_func))
+    monkeypatch.setattr(registry, "get_variable", lambda name: pytest.fail(f"registry probed for {name}"))
+    assert not hasattr(sample_dataset_base.derived, "_ipython_canary_method_should_not_exist_")
+    assert not hasattr(sample_dataset_base.derived, "_private_var")
+    monkeypatch.undo()
+    assert sample_dataset_base.derived["_private_var"].name == "_private_var"
+
 def test_accessor_caching(sample_dataset_base):
     accessor = sample_dataset_base.derived
     pt1 = accessor.potential_temperature
@@ -159,6 +302,31 @@ def test_accessor_caching(sample_dataset_base):
     pt3 = accessor.potential_temperature 
     assert pt1 is not pt3 
 
+def test_results_shared_across_equivalent_datasets(sample_dataset_base, dask_dataset):
+    pt = sample_dataset_base.derived.potential_temperature
+    assert sample_dataset_base.derived.potential_temperature is pt # same input arrays
+    assert sample_dataset_base.copy(deep=True).derived.potential_temperature is not pt
+    pt_dask = dask_dataset.derived.potential_temperature
+    assert dask_dataset.copy().derived.potential_temperature is pt_dask # same Dask graph keys
+    for _ in range(3): # Recomputing reuses the inputs' finalizers rather than adding more
+        sample_dataset_base.derived.clear_cache()
+        sample_dataset_base.derived.potential_temperature
+    temp_id = id(sample_dataset_base.variables["air_temperature"]._data)
+    assert len(accessor_module._keys_by_input[temp_id]) == 1
+    ds64 = sample_dataset_base.astype(np.float64)
+    assert ds64.derived.potential_temperature.dtype == np.float64
+    xderived.config.config["precision"] = "float32"
+    try: # Result-changing config is part of the key
+        assert ds64.copy().derived.potential_temperature.dtype == np.float32
+    finally:
+        xderived.config.config["precision"] = None
+
+def test_dataset_opened_from_file(sample_dataset_base, tmp_path):
+    pytest.importorskip("scipy")
+    sample_dataset_base.to_netcdf(tmp_path / "sample.nc", engine="scipy")
+    with xr.open_dataset(tmp_path / "sample.nc", engine="scipy") as ds: # Lazily indexed, not weak-referenceable
+        np.testing.assert_allclose(ds.derived.potential_temperature.values, sample_dataset_base.derived.potential_temperature.values, rtol=1e-6)
+
 def test_accessor_missing_dependency_error(sample_dataset_base):
     ds_missing = sample_dataset_base.drop_vars(["air_pressure"])
     # Match the exact error message from the accessor
@@ -166,6 +334,47 @@ def test_accessor_missing_dependency_error(sample_dataset_base):
     with pytest.raises(MissingDependencyError, match=re.escape(expected_pattern_fragment)):
         _ = ds_missing.derived.potential_temperature
 
+    registry.register(DerivedVariable("pt_plus_foo", ["potential_temperature", "foo"], lambda ds: ds["foo"]))
+    with pytest.raises(MissingDependencyError, match=re.escape("Missing dependencies: ['foo']")):
+        _ = sample_dataset_base.derived.pt_plus_foo
+    assert "potential_temperature" not in sample_dataset_base.derived._cache # failed before computing it
+
+def test_coordinate_as_dependency(sample_dataset_base):
+    def temp_per_level(ds): return ds["air_temperature"] / ds["level"]
+    registry.register(DerivedVariable("temp_per_level", ["air_temperature", "level"], temp_per_level))
+    result = sample_dataset_base.derived.temp_per_level
+    assert result.dims == ("level", "lat", "lon")
+    np.testing.assert_allclose(result.isel(lat=0, lon=0).values, [280. / 1000, 270. / 850], rtol=1e-6)
+
+def test_failed_derived_dependency_reported_by_dependent(sample_dataset_base):
+    def failing_func(ds): raise ValueError("Intentional failure")
+    def passthrough(ds): return ds["failing_intermediate"]
+    registry.register(DerivedVariable("failing_intermediate", ["air_temperature"], failing_func))
+    registry.register(DerivedVariable("needs_failing_intermediate", ["failing_intermediate"], passthrough))
+    expected = ("unavailable derived dependencies: ['failing_intermediate (reason: "
+                "Error computing derived variable \"failing_intermediate\": Intentional failure)']")
+    with pytest.raises(MissingDependencyError, match=re.escape(expected)):
+        sample_dataset_base.derived.needs_failing_intermediate
+
+def test_dataset_variable_shadows_uncomputable_dependency(sample_dataset_base):
+    first_dep = lambda ds: ds[list(ds.data_vars)[0]]
+    registry.register_many([
+        DerivedVariable("shadowed_mid", ["not_in_dataset"], first_dep),
+        DerivedVariable("shadowed_top", ["shadowed_mid"], first_dep),
+    ])
+    assert not {"shadowed_mid", "shadowed_top"} & registry.computable_set(sample_dataset_base)
+    ds = sample_dataset_base.assign(shadowed_mid=sample_dataset_base["air_temperature"])
+    assert "shadowed_top" in registry.computable_set(ds)
+    assert "shadowed_mid" not in registry.computable_set(ds)
+
+def test_deep_chain_beyond_recursion_limit(sample_dataset_base):
+    def plus_one(ds): return ds[list(ds.data_vars)[0]] + 1
+    depth = sys.getrecursionlimit() + 100
+    deps = ["air_temperature"] + [f"chain_{i}" for i in range(depth - 1)]
+    registry.register_many(DerivedVariable(f"chain_{i}", [dep], plus_one) for i, dep in enumerate(deps))
+    result = getattr(sample_dataset_base.derived, f"chain_{depth - 1}")
+    np.testing.assert_allclose(result.values, sample_dataset_base["air_temperature"].values + depth)
+
 def test_accessor_attribute_error_nonexistent(sample_dataset_base):
     expected_pattern_fragment = "No derived variable named \"nonexistent_var\" is registered or available for this dataset."
     with pytest.raises(AttributeError, match=re.escape(expected_pattern_fragment)):
@@ -193,6 +402,12 @@ def test_potential_temperature_calculation(sample_dataset_base):
     expected_val_l1 = 270.0 * (100000.0 / 85000.0)**(287.058 / 1005.0)
     np.testing.assert_allclose(pt.isel(level=1, lat=0, lon=0).item(), expected_val_l1, rtol=1e-5)
 
+def test_saturation_vapor_pressure_matches_tetens(sample_dataset_base):
+    es = sample_dataset_base.derived.saturation_vapor_pressure_tetens
+    t_c = sample_dataset_base["air_temperature"].values.astype(np.float64) - 273.15
+    np.testing.assert_allclose(es.values, 610.78 * np.exp(17.27 * t_c / (t_c + 237.3)), rtol=1e-5)
+    assert es.dtype == np.float32
+
 def test_wind_speed_calculation(sample_dataset_base):
     ws = sample_dataset_base.derived.wind_speed
     assert ws.attrs["units"] == "m s-1"
@@ -208,6 +423,79 @@ def test_wind_direction_calculation(sample_dataset_base):
     np.testing.assert_allclose(wd.isel(level=0, lat=0, lon=0).item(), expected_wd_val1, rtol=1e-4)
     expected_wd_val2 = 120.963745 
     np.testing.assert_allclose(wd.isel(level=0, lat=1, lon=0).item(), expected_wd_val2, rtol=1e-4)
+    cardinal = xr.Dataset({"eastward_wind": ("x", np.array([0., 0., 1., -1., 0.], dtype=np.float32)),
+                           "northward_wind": ("x", np.array([1., -1., 0., 0., 0.], dtype=np.float32))})
+    np.testing.assert_array_equal(cardinal.derived.wind_from_direction.values, [180., 0., 270., 90., 270.]) # S, N, W, E, calm
+
+def test_wind_pair_computed_together(sample_dataset_base):
+    derived = sample_dataset_base.derived
+    ws = derived.wind_speed
+    assert "wind_from_direction" in derived._cache # sibling output of the same kernel call
+    assert derived.wind_from_direction.name == "wind_from_direction"
+    assert ws.attrs["standard_name"] == "wind_speed"
+
+def test_standard_variables_preserve_float32(sample_dataset_base):
+    for name in sample_dataset_base.derived.list_computable():
+        assert getattr(sample_dataset_base.derived, name).dtype == np.float32, name
+
+def test_standard_variable_attrs_come_from_definitions(sample_dataset_base):
+    ds = sample_dataset_base.copy()
+    for name in ds.data_vars:
+        ds[name].attrs["comment"] = "input metadata"
+    ds["eastward_wind"].attrs["units"] = "knots"
+    for name in ds.derived.list_computable():
+        expected = dict(registry.get_variable(name).attrs)
+        if name == "wind_speed":
+            expected["units"] = "knots" # Speed keeps the components' units
+        assert ds.derived[name].attrs == expected, name
+
+def test_precision_config_sets_storage_dtype(sample_dataset_base):
+    ds64 = sample_dataset_base.astype(np.float64)
+    xderived.config.config["precision"] = "float32"
+    try:
+        rh = ds64.derived.relative_humidity_from_mixing_ratios
+        assert rh.dtype == np.float32
+        assert ds64.derived.wind_speed.dtype == np.float32
+        np.testing.assert_allclose(rh.values, sample_dataset_base.derived.relative_humidity_from_mixing_ratios.values, rtol=1e-5)
+        xderived.config.config["precision"] = "float8"
+        with pytest.raises(ComputationError, match="Unsupported precision"):
+            sample_dataset_base.derived.potential_temperature
+    finally:
+        xderived.config.config["precision"] = None
+
+def test_backend_config_selects_kernels(sample_dataset_base):
+    expected = sample_dataset_base.derived.potential_temperature.values
+    sample_dataset_base.derived.clear_cache()
+    xderived.config.config["backend"] = "jax"
+    try:
+        if importlib.util.find_spec("jax") is None:
+            with pytest.raises(ComputationError, match="needs jax"):
+                sample_dataset_base.derived.potential_temperature
+        else:
+            np.testing.assert_allclose(sample_dataset_base.derived.potential_temperature.values, expected, rtol=1e-5)
+            sample_dataset_base.derived.clear_cache()
+        xderived.config.config["backend"] = "cupy"
+        with pytest.raises(ComputationError, match="Unsupported backend"):
+            sample_dataset_base.derived.potential_temperature
+    finally:
+        xderived.config.config["backend"] = "numpy"
+
+def test_jax_backend_keeps_input_precision(sample_dataset_base):
+    pytest.importorskip("jax")
+    ds64 = sample_dataset_base.astype(np.float64)
+    expected = {name: ds64.derived[name] for name in ("potential_temperature", "wind_speed", "wind_from_direction")}
+    xderived.config.config["backend"] = "jax"
+    try:
+        for dataset in (sample_dataset_base, ds64):
+            jax_ds = dataset.copy(deep=True) # New input arrays: not served from the shared cache
+            with warnings.catch_warnings():
+                warnings.simplefilter("ignore", RuntimeWarning) # float64 without jax_enable_x64
+                for name, values in expected.items():
+                    result = jax_ds.derived[name]
+                    assert result.dtype == dataset["air_temperature"].dtype, name
+                    np.testing.assert_allclose(result.values, values.values, rtol=1e-5)
+    finally:
+        xderived.config.config["backend"] = "numpy"
 
 def test_dask_integration(dask_dataset):
     assert hasattr(dask_dataset["air_temperature"].data, "dask")
@@ -221,6 +509,180 @@ def test_dask_integration(dask_dataset):
     assert not hasattr(computed_val.data, "dask")
     np.testing.assert_allclose(computed_val.item(), 280.0, rtol=1e-5)
 
+def test_lazy_config_defers_numpy_computation(sample_dataset_base):
+    xderived.config.config["lazy"] = True
+    try:
+        pt_lazy = sample_dataset_base.derived.potential_temperature
+        assert hasattr(pt_lazy.data, "dask"), "Potential Temperature should be Dask-backed when lazy"
+        pt_eager = sample_dataset_base.derived.compute("potential_temperature")
+        assert isinstance(pt_eager.data, np.ndarray)
+        np.testing.assert_allclose(pt_eager.isel(level=0, lat=0, lon=0).item(), 280.0, rtol=1e-5)
+    finally:
+        xderived.config.config["lazy"] = False
+
+def test_reduction_options_scoped_to_derived_funcs(sample_dataset_base, monkeypatch):
+    monkeypatch.setattr(xderived.accessor, "_REDUCTION_OPTIONS", {"use_flox": False})
+    seen = []
+    def mean_temp(ds):
+        seen.append(xr.get_options()["use_flox"])
+        return ds["air_temperature"].mean("level")
+    registry.register(DerivedVariable("mean_temp_for_options_test", ["air_temperature"], mean_temp))
+    sample_dataset_base.derived.mean_temp_for_options_test
+    assert seen == [False]
+    assert xr.get_options()["use_flox"] is True
+
+def test_point_value(sample_dataset_base):
+    derived = sample_dataset_base.derived
+    expected = derived.relative_humidity_from_mixing_ratios.isel(level=1, lat=0, lon=1).item()
+    assert derived.point("relative_humidity_from_mixing_ratios", level=1, lat=0, lon=1) == pytest.approx(expected)
+    def anomaly(ds): return ds["air_temperature"] - ds["air_temperature"].mean("lon") # Reduces: not elementwise
+    def fraction_of_max(ds): return ds["relative_humidity_from_mixing_ratios"] / ds["relative_humidity_from_mixing_ratios"].max()
+    registry.register_many([DerivedVariable("t_anomaly_for_point", ["air_temperature"], anomaly),
+                            DerivedVariable("rh_fraction_for_point", ["relative_humidity_from_mixing_ratios"], fraction_of_max)])
+    try:
+        for name in ("t_anomaly_for_point", "rh_fraction_for_point"): # Computed in full, then indexed
+            full = derived[name]
+            cell = dict(zip(full.dims, np.unravel_index(int(np.nanargmin(full.values)), full.shape)))
+            assert derived.point(name, **cell) == pytest.approx(full.min().item())
+        assert derived.point("rh_fraction_for_point", **cell) < 1 # Slicing first would divide the cell by itself
+        assert registry.get_variable("potential_temperature").elementwise and not registry.get_variable("t_anomaly_for_point").elementwise
+    finally:
+        registry.unregister("t_anomaly_for_point")
+        registry.unregister("rh_fraction_for_point")
+
+def test_shared_intermediate_is_one_dask_node(dask_dataset):
+    derived = dask_dataset.derived
+    rh = derived.relative_humidity_from_mixing_ratios
+    theta_e = derived.equivalent_potential_temperature_approx
+    assert hasattr(rh.data, "dask") and hasattr(theta_e.data, "dask") # Nothing computed yet
+    mixing_ratio_key = derived.mixing_ratio_from_specific_humidity.data.name
+    assert mixing_ratio_key in rh.data.__dask_graph__().layers
+    assert mixing_ratio_key in theta_e.data.__dask_graph__().layers # Same node, not a recomputed copy
+
+def test_compute_many(dask_dataset):
+    names = ["potential_temperature", "wind_speed", "wind_from_direction"]
+    result = dask_dataset.derived.compute_many(names)
+    assert list(result.data_vars) == names
+    for name in names:
+        assert isinstance(result[name].data, np.ndarray)
+        np.testing.assert_allclose(result[name].values, getattr(dask_dataset.derived, name).values)
+
+def test_dask_small_chunks_are_coarsened(dask_dataset):
+    pt = dask_dataset.derived.potential_temperature
+    assert pt.data.numblocks == (1, 1, 1) # 4-byte chunks are merged before computing
+    xderived.config.config["min_chunk_bytes"] = None
+    try:
+        ws = dask_dataset.derived.wind_speed
+        assert ws.data.numblocks == (2, 2, 2)
+    finally:
+        xderived.config.config["min_chunk_bytes"] = 1 << 20
+
+def test_standard_variable_is_one_dask_layer(dask_dataset):
+    xderived.config.config["min_chunk_bytes"] = None
+    try:
+        derived = dask_dataset.derived
+        es = derived.saturation_vapor_pressure_tetens
+        ws = derived.saturation_mixing_ratio
+        layers = ws.data.__dask_graph__().layers
+        assert len(layers) == len(es.data.__dask_graph__().layers | dask_dataset["air_pressure"].data.__dask_graph__().layers) + 1
+    finally:
+        xderived.config.config["min_chunk_bytes"] = 1 << 20
+
+_disk_cache_calls = [] # Module-level: a closed-over list would be part of the func's disk-cache key
+
+def test_disk_cache_by_content_hash(sample_dataset_base, tmp_path):
+    pytest.importorskip("scipy") # netCDF backend for the cache files
+    calls = _disk_cache_calls
+    calls.clear()
+    def doubled(ds):
+        _disk_cache_calls.append(1)
+        return ds["air_temperature"] * 2
+    registry.register(DerivedVariable("doubled_temp_for_cache_test", ["air_temperature"], doubled))
+    xderived.config.config["cache_dir"] = str(tmp_path)
+    try:
+        first = sample_dataset_base.derived.doubled_temp_for_cache_test
+        assert len(list(tmp_path.glob("doubled_temp_for_cache_test-*.nc"))) == 1
+        second = sample_dataset_base.copy(deep=True).derived.doubled_temp_for_cache_test
+        xr.testing.assert_identical(first, second)
+        assert len(calls) == 1
+        changed = sample_dataset_base.copy(deep=True)
+        changed["air_temperature"] += 1
+        changed.derived.doubled_temp_for_cache_test
+        assert len(calls) == 2
+        xderived.config.config["precision"] = "float32"
+        sample_dataset_base.copy(deep=True).derived.doubled_temp_for_cache_test # Config is part of the key
+        assert len(calls) == 3
+    finally:
+        xderived.config.config["precision"] = None
+        xderived.config.config["cache_dir"] = None
+        registry.unregister("doubled_temp_for_cache_test")
+
+def test_disk_cache_tracks_closures_and_in_place_changes(tmp_path):
+    pytest.importorskip("scipy")
+    def make_ds(): return xr.Dataset({"air_temperature": ("x", np.array([1., 2., 3.]))})
+    def scaled_by(k): return lambda ds: ds["air_temperature"] * k
+    xderived.config.config["cache_dir"] = str(tmp_path)
+    try:
+        registry.register(DerivedVariable("scaled_for_cache_test", ["air_temperature"], scaled_by(2)))
+        np.testing.assert_array_equal(make_ds().derived.scaled_for_cache_test.values, [2., 4., 6.])
+        registry.register(DerivedVariable("scaled_for_cache_test", ["air_temperature"], scaled_by(3)), replace_ok=True)
+        np.testing.assert_array_equal(make_ds().derived.scaled_for_cache_test.values, [3., 6., 9.]) # Closure cell is in the key
+        ds = make_ds()
+        ds.derived.scaled_for_cache_test
+        ds["air_temperature"] = ("x", np.array([10., 20., 30.]))
+        ds.derived.clear_cache()
+        np.testing.assert_array_equal(ds.derived.scaled_for_cache_test.values, [30., 60., 90.]) # Re-hashed after clear_cache
+    finally:
+        xderived.config.config["cache_dir"] = None
+        registry.unregister("scaled_for_cache_test")
+
+def test_mapping_inputs(sample_dataset_base, dask_dataset):
+    seen = []
+    def fraction_of_max(deps):
+        seen.append(type(deps))
+        rh = deps["relative_humidity_from_mixing_ratios"]
+        return rh / rh.max()
+    registry.register(DerivedVariable("rh_fraction_of_max", ["relative_humidity_from_mixing_ratios"], fraction_of_max, accepts="mapping"))
+    result = sample_dataset_base.derived.rh_fraction_of_max
+    assert float(result.max()) == pytest.approx(1.0)
+    dask_dataset.derived.rh_fraction_of_max
+    assert seen == [dict, xr.Dataset] # Dask inputs still go through a Dataset to be rechunked
+    with pytest.raises(ValueError, match="accepts"):
+        DerivedVariable("bad_accepts", ["air_temperature"], fraction_of_max, accepts="list")
+
+def test_keyword_inputs(sample_dataset_base, dask_dataset):
+    def celsius_difference(air_temperature, potential_temperature):
+        return potential_temperature - air_temperature
+    dv = DerivedVariable("theta_minus_t", ["air_temperature", "potential_temperature"], celsius_difference)
+    assert dv.accepts == "kwargs" # Inferred: the parameters are the dependency names
+    registry.register(dv)
+    expected = sample_dataset_base.derived.potential_temperature - sample_dataset_base["air_temperature"]
+    np.testing.assert_allclose(sample_dataset_base.derived.theta_minus_t.values, expected.values)
+    np.testing.assert_allclose(dask_dataset.derived.theta_minus_t.values, expected.values)
+    assert DerivedVariable("single_ds_param", ["air_temperature"], lambda ds: ds["air_temperature"]).accepts == "dataset"
+    def doubled(air_temperature): # Callable with the Dataset, as before accepts existed: it still gets one
+        return air_temperature["air_temperature"] * 2
+    assert DerivedVariable("doubled_param_named_dep", ["air_temperature"], doubled).accepts == "dataset"
+    assert DerivedVariable("doubled_kwargs", ["air_temperature"], doubled, accepts="kwargs").accepts == "kwargs"
+    with pytest.raises(ValueError, match="kwargs"):
+        DerivedVariable("kwargs_expr", ["air_temperature"], None, expr="air_temperature", accepts="kwargs")
+
+def test_jit_decorated_func(sample_dataset_base, dask_dataset):
+    @xderived.jit
+    def theta(air_temperature, air_pressure):
+        return air_temperature * (100000.0 / air_pressure) ** (287.058 / 1005.0)
+    assert theta.dependencies == ["air_temperature", "air_pressure"]
+    registry.register(DerivedVariable("jit_theta", theta.dependencies, theta))
+    expected = sample_dataset_base.derived.potential_temperature
+    result = sample_dataset_base.derived.jit_theta
+    assert result.dtype == np.float32
+    np.testing.assert_allclose(result.values, expected.values, rtol=1e-5)
+    np.testing.assert_allclose(dask_dataset.derived.jit_theta.values, expected.values, rtol=1e-5)
+    profile = sample_dataset_base.assign(air_pressure=sample_dataset_base["air_pressure"].isel(lat=0, lon=0, drop=True))
+    with warnings.catch_warnings():
+        warnings.simplefilter("error") # Broadcast inputs reach the compiled function without FutureWarnings
+        np.testing.assert_allclose(profile.derived.jit_theta.values, profile.derived.potential_temperature.values, rtol=1e-5)
+
 def test_custom_variable_registration_and_use(sample_dataset_base):
     def celsius_func(ds):
         temp_c = ds["air_temperature"] - 273.15
@@ -249,6 +711,7 @@ def test_custom_variable_registration_and_use(sample_dataset_base):
     repr_str = repr(sample_dataset_base.derived)
     assert celsius_var_name + ": Air Temperature in Celsius" in repr_str
     assert "(computable)" in repr_str # Updated status string
+    assert repr(sample_dataset_base.copy().derived) is repr_str # Memoized per variable names and registry version
     
     if registry.get_variable(celsius_var_name) is not None:
         registry.unregister(celsius_var_name)
@@ -265,6 +728,27 @@ def test_chained_relative_humidity(sample_dataset_base):
     # Basic check, not validating exact values here, just that it runs and has expected attrs
     assert rh.shape == sample_dataset_base["specific_humidity"].shape
 
+def test_relative_humidity_guards_without_warnings(sample_dataset_base):
+    ds = sample_dataset_base.assign(saturation_mixing_ratio=sample_dataset_base["specific_humidity"] * 0) # Shadows the derived one
+    with warnings.catch_warnings():
+        warnings.simplefilter("error") # No divide-by-zero warnings for slots that end up NaN
+        rh = ds.derived.relative_humidity_from_mixing_ratios
+    assert np.isnan(rh.values).all()
+
+def test_fused_relative_humidity_matches_chain(sample_dataset_base, dask_dataset):
+    chained = sample_dataset_base.derived.relative_humidity_from_mixing_ratios
+    fused = sample_dataset_base.derived.relative_humidity_fused
+    np.testing.assert_allclose(fused.values, chained.values, rtol=1e-5)
+    assert fused.dtype == np.float32 and fused.attrs["standard_name"] == "relative_humidity"
+    np.testing.assert_allclose(dask_dataset.derived.relative_humidity_fused.values, chained.values, rtol=1e-5)
+    saturated = sample_dataset_base.assign(specific_humidity=sample_dataset_base["specific_humidity"].where(False, 1.0))
+    assert np.isnan(saturated.derived.relative_humidity_fused.values).all() # 1 - q <= 0
+    profile = sample_dataset_base.assign(air_pressure=sample_dataset_base["air_pressure"].isel(lat=0, lon=0, drop=True))
+    with warnings.catch_warnings():
+        warnings.simplefilter("error") # Broadcast inputs reach the numba loop without FutureWarnings
+        np.testing.assert_allclose(profile.derived.relative_humidity_fused.values,
+                                   profile.derived.relative_humidity_from_mixing_ratios.values, rtol=1e-5)
+
 def test_chained_equivalent_potential_temperature(sample_dataset_base):
     assert "equivalent_potential_temperature_approx" in sample_dataset_base.derived.available_variables()
     theta_e = sample_dataset_base.derived.equivalent_potential_temperature_approx
@@ -288,6 +772,17 @@ def test_discovery_methods(sample_dataset_base):
     search_results = sample_dataset_base.derived.search_variables("temperature")
     assert any(item["name"] == "potential_temperature" for item in search_results)
     assert any(item["name"] == "equivalent_potential_temperature_approx" for item in search_results)
+    assert [item["name"] for item in registry.search_variables("SQRT(U", ["formula_str"])] == ["wind_speed"]
+    def dummy_func(ds): return ds["air_temperature"]
+    registry.register(DerivedVariable("registered_after_search", ["air_temperature"], dummy_func, "Zonal thing"))
+    assert [item["name"] for item in registry.search_variables("zonal")] == ["registered_after_search"]
+
+def test_expected_signature(sample_dataset_base, dask_dataset):
+    signature = sample_dataset_base.derived.get_expected_signature("potential_temperature")
+    assert signature["dims_str"] == "(lat, level, lon)" and not signature["is_dask"]
+    assert dask_dataset.derived.get_expected_signature("potential_temperature")["is_dask"]
+    assert sample_dataset_base[["air_pressure"]].derived.get_expected_signature("potential_temperature")["dims_str"] == "(...)"
+    assert sample_dataset_base.derived.get_expected_signature("not_registered_var") == {"error": "not_registered"}
 
 def test_cycle_detection_in_accessor(sample_dataset_base):
     # Setup a cycle
@@ -305,6 +800,10 @@ def test_cycle_detection_in_accessor(sample_dataset_base):
         _ = sample_dataset_base.derived.cycle_var_a
 
     # Clean up
+    assert registry.in_cycle("cycle_var_a")
+    assert registry.cycle_members("cycle_var_b") == {"cycle_var_a", "cycle_var_b"}
+    assert registry.cycle_members("potential_temperature") == frozenset()
+    assert registry.transitive_dependencies("cycle_var_a") == {"cycle_var_a", "cycle_var_b"}
     registry.unregister("cycle_var_a")
     registry.unregister("cycle_var_b")
 
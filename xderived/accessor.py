@@ -5,114 +5,525 @@
 import xarray as xr
 import numpy as np
 from .core import registry, DerivedVariable
-from .utils import MissingDependencyError, ComputationError, RegistrationError
-from typing import Dict, List, Any, Optional, Set, Tuple
+from .utils import MissingDependencyError, ComputationError, RegistrationError, dask_array_module
+from typing import Dict, List, Any, Optional, Set, FrozenSet, Tuple, Iterable, Iterator, Callable
 from html import escape
 from . import config # For accessing xderived.config.config
-import copy # For deepcopy if needed, though trying to avoid for now
+import collections
+import hashlib
+import importlib.util
+import inspect
+import os
+import warnings
+import weakref
+from pathlib import Path
+
+# Dask is optional (config["lazy"] is ignored without it) and only imported once arrays need it
+_HAS_DASK = importlib.util.find_spec("dask") is not None
+
+# Rendered HTML keyed by (dataset schema, registry version, repr config); LRU-evicted
+_HTML_CACHE_SIZE = 32
+_html_cache: "collections.OrderedDict[Tuple[Any, ...], str]" = collections.OrderedDict()
+# Same for the plain-text repr, keyed by (variable names, coord names, registry version)
+_text_cache: "collections.OrderedDict[Tuple[Any, ...], str]" = collections.OrderedDict()
+
+# xarray options applied while a derived func runs: its NaN-aware reductions (mean, std,
+# nansum, ...) then use bottleneck's/numbagg's compiled loops instead of NumPy's
+_REDUCTION_OPTIONS = {
+    option: True for option, module in (("use_bottleneck", "bottleneck"), ("use_numbagg", "numbagg"))
+    if option in getattr(xr, "get_options", dict)() and importlib.util.find_spec(module) is not None
+}
+
+# Results shared by every accessor whose dataset holds the same input arrays (e.g. shallow
+# copies); an entry lives while some accessor still caches it and all its inputs are alive
+_shared_cache: "weakref.WeakValueDictionary[Tuple[Any, ...], xr.DataArray]" = weakref.WeakValueDictionary()
+# Shared-cache keys by id() of an in-memory input array, and the one finalizer per array that
+# drops them before the id can be reused
+_keys_by_input: Dict[int, Set[Tuple[Any, ...]]] = {}
+
+# Config keys that change what a derived variable evaluates to (dtype, laziness, chunking, kernels)
+_RESULT_CONFIG_KEYS = ("lazy", "min_chunk_bytes", "precision", "backend", "fast_reductions")
+
+def _result_settings() -> Tuple[Any, ...]:
+    return tuple(config.config.get(key) for key in _RESULT_CONFIG_KEYS)
+
+def _drop_input(input_id: int) -> None:
+    for key in _keys_by_input.pop(input_id, ()):
+        _shared_cache.pop(key, None)
+
+# HTML fragments are f-strings, compiled once with the module; _render_html only fills them in
+def _render_html_header(num_total_registered: int) -> str:
+    return f"""
+        <div class="xr-wrap" style="display:flow-root; margin-bottom: 0.5em;">
+          <div class="xr-header">
+            <div class="xr-obj-type" style="font-weight: bold;">xderived Accessor</div>
+            <div class="xr-dims" style="font-style: italic;">({num_total_registered} registered)</div>
+          </div>
+        """
+
+# Status label and colour of an item, by computability
+_HTML_STATUS = {True: ("Computable", "#28a745"), False: ("Unavailable", "#dc3545")}
+
+def _render_html_item(name: str, dims_str: str, dtype: str, computable: bool, description: str, extra_info: str) -> str:
+    """One registered variable in the HTML repr; ``extra_info`` is pre-rendered (dask/missing/reason) markup."""
+    status_text, status_color = _HTML_STATUS[computable]
+    return f"""
+        <li class="xr-section-item" style="margin-bottom: 0.5em; padding: 0.3em; border: 1px solid #e0e0e0;">
+          <div class="xr-variable-name"><span style="font-weight: bold;">{name}</span></div>
+          <div class="xr-variable-meta" style="display: flex; flex-wrap: wrap; margin-left: 1em;">
+            <div class="xr-variable-dims" style="margin-right: 1em;">{dims_str}</div>
+            <div class="xr-variable-dtype" style="margin-right: 1em;">{dtype}</div>
+            <div class="xr-variable-computed" style="color: {status_color}; font-weight: bold;">{status_text}</div>
+          </div>
+          <div class="xr-variable-description" style="margin-left: 1em; font-style: italic; color: #555;">{description}</div>
+          {extra_info}
+        </li>"""
+_HTML_DASK_INFO = '<div class="xr-variable-dask-info" style="margin-left: 1em; color: #6c757d;">(Dask-backed)</div>'
+
+def _lru_get(cache: "collections.OrderedDict[Tuple[Any, ...], str]", key: Tuple[Any, ...], render: Callable[[], str]) -> str:
+    """Return ``cache[key]``, rendering and storing it (evicting the oldest entry) on a miss."""
+    text = cache.get(key)
+    if text is not None:
+        cache.move_to_end(key)
+        return text
+    text = cache[key] = render()
+    if len(cache) > _HTML_CACHE_SIZE:
+        cache.popitem(last=False)
+    return text
+
+def _dataset_schema(ds: xr.Dataset) -> Tuple[Tuple[Any, ...], ...]:
+    """Structural fingerprint of everything the HTML repr reads from a dataset."""
+    return tuple(sorted((name, var.dims, var.chunks is not None) for name, var in ds.variables.items()))
+
+def _coarsen_small_chunks(ds: xr.Dataset) -> xr.Dataset:
+    """Rechunk Dask-backed inputs whose chunks are below ``config["min_chunk_bytes"]``.
+
+    Tiny chunks make the task graph grow with the number of elements rather than with the
+    data volume; following Zarr's ~1 MB guideline keeps per-task overhead negligible.
+    """
+    min_chunk_bytes = config.config.get("min_chunk_bytes")
+    dask_vars = [var for var in ds.variables.values() if var.chunks is not None]
+    if not dask_vars:
+        return ds
+    ds = ds.unify_chunks()
+    if min_chunk_bytes and any(
+        int(np.prod([chunks[0] for chunks in var.chunks])) * var.dtype.itemsize < min(min_chunk_bytes, var.nbytes)
+        for var in dask_vars
+    ):
+        ds = ds.chunk("auto").unify_chunks()
+    return ds
+
+def _array_token(data: Any) -> Any:
+    """Identity of an input array: the graph key for Dask arrays, the object id otherwise.
+
+    None for arrays that can't be weakly referenced (e.g. xarray's MemoryCachedArray for files
+    opened without chunks): their id could be reused unnoticed, so results built on them aren't shared.
+    """
+    dask_array = dask_array_module()
+    if dask_array is not None and isinstance(data, dask_array.Array):
+        return data.name
+    try:
+        weakref.ref(data)
+    except TypeError:
+        return None
+    return id(data)
+
+def _finalize(computed_da: xr.DataArray, var_def: DerivedVariable) -> xr.DataArray:
+    """Merge the definition's attrs under the computed ones and name the result after the variable."""
+    computed_da.attrs = {**var_def.attrs, **computed_da.attrs} if computed_da.attrs else dict(var_def.attrs)
+    if computed_da.name is None or computed_da.name != var_def.name:
+        computed_da.name = var_def.name
+    return computed_da
+
+def _data_token(da: xr.DataArray) -> Optional[str]:
+    """Content hash of a DataArray (values, dims and coordinates), or None if it cannot be hashed."""
+    h = hashlib.blake2b(digest_size=16)
+    for var_name, var in [(da.name, da.variable), *sorted(da.coords.variables.items())]:
+        if var.dtype.hasobject:
+            return None
+        h.update(repr((var_name, var.dims, var.shape, var.dtype.str)).encode())
+        if var.chunks is not None:
+            h.update(var.data.name.encode()) # Dask keys are deterministic tokens of the graph
+        else:
+            h.update(np.ascontiguousarray(var.values).tobytes())
+    return h.hexdigest()
+
+_STABLE_SCALARS = (type(None), bool, int, float, complex, str, bytes, np.generic)
+
+def _value_token(value: Any) -> Optional[str]:
+    """Stable text for a value a func closes over or defaults to, or None if it has none.
+
+    Immutable values only: scalars, read-only NumPy arrays and tuples/frozensets of them. Mutable
+    containers could change after the key is memoized, and functions or other objects have no
+    process-independent representation.
+    """
+    if isinstance(value, _STABLE_SCALARS):
+        return repr(value)
+    if isinstance(value, np.ndarray) and not value.flags.writeable and not value.dtype.hasobject:
+        return repr((value.dtype.str, value.shape, hashlib.blake2b(np.ascontiguousarray(value).tobytes(), digest_size=16).hexdigest()))
+    if isinstance(value, (tuple, frozenset)):
+        items = [_value_token(item) for item in value]
+        if None in items:
+            return None
+        return f"{type(value).__name__}({','.join(sorted(items) if isinstance(value, frozenset) else items)})"
+    return None
+
+def _definition_token(var_def: DerivedVariable) -> Optional[str]:
+    """Stable (across processes) fingerprint of how a derived variable is computed.
+
+    Covers the func's bytecode, literal constants, closure cells and defaults, so re-registering a
+    closure over a changed parameter gets a new key; None if a closed-over value can't be fingerprinted.
+    """
+    func = inspect.unwrap(var_def.func) if var_def.func is not None else None # e.g. the user function behind @jit
+    code = getattr(func, "__code__", None)
+    consts = tuple(c for c in code.co_consts if isinstance(c, (int, float, complex, str, bytes))) if code else None
+    try:
+        cells = tuple(cell.cell_contents for cell in getattr(func, "__closure__", None) or ())
+    except ValueError: # An empty cell: a variable the func closes over that was never assigned
+        return None
+    bound = _value_token((cells, getattr(func, "__defaults__", None), getattr(func, "__kwdefaults__", None)))
+    if bound is None:
+        return None
+    return repr((
+        var_def.name, tuple(var_def.dependencies), var_def.expr,
+        getattr(func, "__module__", None), getattr(func, "__qualname__", None),
+        code.co_code if code else None, consts, bound,
+    ))
 
 @xr.register_dataset_accessor("derived")
 class DerivedAccessor:
     """Xarray Dataset accessor to calculate and access derived variables."""
+    # Fixed attribute layout: no per-instance __dict__, and slot reads skip the dict lookup
+    __slots__ = ("_ds", "_cache", "_data_tokens", "_content_keys", "_shared_keys", "_dir_cache")
+    # Public methods; __getattr__ never treats these names as derived variables
+    _METHODS = frozenset({
+        "list_computable", "available_variables", "get_dependencies", "get_metadata", "search_variables",
+        "clear_cache", "get_status", "get_expected_signature", "compute", "compute_many", "point",
+    })
+
     def __init__(self, ds: xr.Dataset):
         self._ds = ds
         self._cache: Dict[str, xr.DataArray] = {}
+        self._data_tokens: Dict[str, Optional[str]] = {}
+        self._content_keys: Tuple[int, Dict[str, Optional[str]]] = (-1, {}) # (registry version, name -> key)
+        self._shared_keys: Dict[str, Tuple[Any, ...]] = {}
+        self._dir_cache: Optional[Tuple[int, List[str]]] = None
 
     def __dir__(self) -> List[str]:
-        attrs = list(super().__dir__())
-        registered_vars = [var.name for var in registry.list_all()]
-        attrs.extend(registered_vars)
-        attrs.extend(["list_computable", "available_variables", "get_dependencies", "get_metadata", "search_variables", "clear_cache", "get_status", "get_expected_signature"])
-        return sorted(list(set(attrs)))
+        # Tab completion calls this on every keystroke; the listing only changes with the registry
+        if self._dir_cache is None or self._dir_cache[0] != registry._version:
+            attrs = list(super().__dir__())
+            registered_vars = [var.name for var in registry.list_all()]
+            attrs.extend(registered_vars)
+            attrs.extend(self._METHODS)
+            self._dir_cache = (registry._version, sorted(set(attrs)))
+        return list(self._dir_cache[1])
 
-    def _compute_derived_variable(self, name: str, resolving_stack: Set[str]) -> xr.DataArray:
-        if name in self._cache:
-            return self._cache[name]
+    def _compute_derived_variable(self, name: str) -> xr.DataArray:
+        """Compute ``name``: plan the derived variables it needs, then evaluate them bottom-up."""
+        cached = self._cache.get(name)
+        if cached is not None:
+            return cached
+        order, pending, failures = self._plan(name)
+        for node in order: # Dependencies first, so each node's derived inputs are already cached
+            try:
+                self._evaluate(node, failures, *pending[node])
+            except (MissingDependencyError, ComputationError) as e:
+                if node == name:
+                    raise
+                failures[node] = str(e).splitlines()[0] # Reported by the variables that need it
+        return self._cache[name]
+
+    def _plan(self, name: str) -> Tuple[List[str], Dict[str, Tuple[Any, Optional[Path]]], Dict[str, str]]:
+        """Iterative DFS over the derived variables ``name`` needs that are not cached yet.
 
-        if name in resolving_stack:
-            raise ComputationError(f"Circular dependency detected for variable {name}. Path: {list(resolving_stack)} -> {name}")
+        Returns them in post-order (a topological order, dependencies first) with each one's
+        shared-cache key and disk path, plus the first line of the error for any that can
+        already be seen to fail. Errors for ``name`` itself, and cycles, are raised.
+        """
+        order: List[str] = []
+        pending: Dict[str, Tuple[Any, Optional[Path]]] = {}
+        failures: Dict[str, str] = {}
+        on_path: Set[str] = set() # Gray: entered, dependencies still being visited
+        done: Set[str] = set() # Black: planned, cached or failed
+        stack: List[Tuple[str, Iterator[str]]] = []
+
+        def visit(node: str) -> None:
+            try:
+                prepared = self._prepare(node)
+            except (MissingDependencyError, ComputationError, AttributeError) as e:
+                if node == name or "Circular dependency detected" in str(e):
+                    raise
+                failures[node] = str(e).splitlines()[0]
+                done.add(node)
+                return
+            if prepared is None: # Served from a cache
+                done.add(node)
+                return
+            pending[node] = prepared
+            on_path.add(node)
+            var_def = registry.get_variable(node)
+            derived_deps = var_def._deps_fs - self._ds.variables.keys()
+            stack.append((node, (dep for dep in var_def.dependencies if dep in derived_deps)))
+
+        visit(name)
+        while stack:
+            node, deps = stack[-1]
+            for dep in deps:
+                if dep in on_path:
+                    path = [entry for entry, _ in stack]
+                    raise ComputationError(f"Circular dependency detected for variable {dep}. Path: {path} -> {dep}")
+                if dep not in done:
+                    visit(dep)
+                    break
+            else:
+                stack.pop()
+                on_path.discard(node)
+                done.add(node)
+                order.append(node)
+        return order, pending, failures
+
+    def _prepare(self, name: str) -> Optional[Tuple[Any, Optional[Path]]]:
+        """Checks that need no dependency computed: caches and definition-level errors.
+
+        Returns None when ``name`` was served from the shared or disk cache (and is now in
+        ``self._cache``), otherwise its shared-cache key and disk-cache path.
+        """
+        if name in self._cache:
+            return None
 
         derived_var_def = registry.get_variable(name)
         if not derived_var_def:
             raise AttributeError(f"No derived variable named \"{name}\" is registered.")
 
-        resolving_stack.add(name)
-        
-        dep_ds_dict = {}
-        missing_base_deps = []
-        unavailable_derived_deps = []
-
-        for dep_name in derived_var_def.dependencies:
-            if dep_name in self._ds.variables or dep_name in self._ds.coords:
-                dep_ds_dict[dep_name] = self._ds[dep_name]
-            elif registry.get_variable(dep_name):
-                try:
-                    dep_ds_dict[dep_name] = self._compute_derived_variable(dep_name, resolving_stack.copy())
-                except ComputationError as e: 
-                    if "Circular dependency detected" in str(e):
-                        resolving_stack.remove(name) 
-                        raise
-                    unavailable_derived_deps.append(f"{dep_name} (reason: {str(e).splitlines()[0]})" )
-                except (MissingDependencyError, AttributeError) as e: 
-                    unavailable_derived_deps.append(f"{dep_name} (reason: {str(e).splitlines()[0]})" )
-            else:
-                missing_base_deps.append(dep_name)
-
-        if missing_base_deps or unavailable_derived_deps:
-            resolving_stack.remove(name)
-            current_var_missing_base = [dep for dep in derived_var_def.dependencies 
-                                        if dep not in self._ds.variables and 
-                                           dep not in self._ds.coords and 
-                                           not registry.get_variable(dep)]
-            if current_var_missing_base:
-                 raise MissingDependencyError(
-                    f"Derived variable \"{name}\" cannot be computed. Missing dependencies: {current_var_missing_base}"
-                )
-            else:
-                error_parts = []
-                if missing_base_deps: error_parts.append(f"missing base dependencies: {missing_base_deps}")
-                if unavailable_derived_deps: error_parts.append(f"unavailable derived dependencies: {unavailable_derived_deps}")
-                error_details_str = "; ".join(error_parts)
+        if self._on_unbroken_cycle(name): # Known from the registry's SCC pass; no need to walk into it
+            raise ComputationError(f"Circular dependency detected for variable {name}. Cycle: {sorted(registry.cycle_members(name))}")
+
+        # One set difference against the dataset; only the (usually empty) remainder is checked one by one
+        unresolved = derived_var_def._deps_fs - self._ds.variables.keys()
+        if unresolved:
+            missing_base_deps = [dep for dep in derived_var_def.dependencies
+                                 if dep in unresolved and not registry.get_variable(dep)]
+            if missing_base_deps: # Fail before computing any derived dependency
                 raise MissingDependencyError(
-                    f"Cannot compute derived variable \"{name}\". Failed to resolve dependencies: {error_details_str}. "
-                    f"Dataset variables: {list(self._ds.variables.keys()) + list(self._ds.coords.keys())}"
+                    f"Derived variable \"{name}\" cannot be computed. Missing dependencies: {missing_base_deps}"
                 )
 
-        dependencies_ds = xr.Dataset(dep_ds_dict)
+        shared_key = self._shared_key(name)
+        computed_da = _shared_cache.get(shared_key) if shared_key is not None else None
+        if computed_da is not None:
+            self._cache[name] = computed_da
+            self._shared_keys[name] = shared_key
+            return None
+
+        disk_path = self._disk_cache_path(name)
+        if disk_path is not None and disk_path.exists():
+            self._cache[name] = xr.load_dataarray(disk_path)
+            return None
+        return shared_key, disk_path
+
+    def _evaluate(self, name: str, failures: Dict[str, str], shared_key: Any, disk_path: Optional[Path]) -> None:
+        """Run ``name``'s func on its inputs (derived ones already cached) and cache the result."""
+        if name in self._cache: # A multi-output sibling computed earlier in the plan
+            return
+        derived_var_def = registry.get_variable(name)
+        unresolved = derived_var_def._deps_fs - self._ds.variables.keys()
+
+        unavailable_derived_deps = [f"{dep_name} (reason: {failures[dep_name]})"
+                                    for dep_name in derived_var_def.dependencies if dep_name in failures]
+        if unavailable_derived_deps:
+            raise MissingDependencyError(
+                f"Cannot compute derived variable \"{name}\". Failed to resolve dependencies: "
+                f"unavailable derived dependencies: {unavailable_derived_deps}. "
+                f"Dataset variables: {list(self._ds.variables)}"
+            )
 
+        lazy = _HAS_DASK and config.config.get("lazy", False)
+        accepts_mapping = derived_var_def.accepts != "dataset" # kwargs funcs get the mapping unpacked
+        if not (unresolved or lazy or accepts_mapping):
+            # Only dataset variables, already aligned: selecting them skips the coordinate
+            # merge that building a Dataset from separate DataArrays does on every call
+            dependencies = self._ds[derived_var_def.dependencies]
+        else:
+            dep_ds_dict = {}
+            for dep_name in derived_var_def.dependencies:
+                if dep_name in unresolved: # A registered derived variable, evaluated earlier in the plan
+                    dep_ds_dict[dep_name] = self._cache[dep_name]
+                else:
+                    dep_da = self._ds[dep_name]
+                    if lazy and dep_da.chunks is None:
+                        dep_da = dep_da.chunk() # Single chunk: defers the work until .compute()
+                    dep_ds_dict[dep_name] = dep_da
+            dask_array = dask_array_module()
+            if accepts_mapping and (dask_array is None or not any(isinstance(da.data, dask_array.Array) for da in dep_ds_dict.values())):
+                dependencies = dep_ds_dict # No Dataset, so no alignment; Dask inputs still go through one to be rechunked
+            else:
+                dependencies = xr.Dataset(dep_ds_dict)
+        if isinstance(dependencies, xr.Dataset):
+            dependencies = _coarsen_small_chunks(dependencies)
+
+        reduction_options = _REDUCTION_OPTIONS if config.config.get("fast_reductions", True) else {}
         try:
-            computed_da = derived_var_def.func(dependencies_ds)
+            with xr.set_options(**reduction_options): # Scoped: the user's global options are left alone
+                if derived_var_def.accepts == "kwargs":
+                    computed_da = derived_var_def.func(**{dep_name: dependencies[dep_name] for dep_name in derived_var_def.dependencies})
+                else:
+                    computed_da = derived_var_def.compile()(dependencies)
         except Exception as e:
-            resolving_stack.remove(name)
             raise ComputationError(f"Error computing derived variable \"{name}\": {e}") from e
 
+        if isinstance(computed_da, xr.Dataset) and name in computed_da.data_vars:
+            # Multi-output func: keep the registered siblings computed in the same pass
+            for sibling_name, sibling_da in computed_da.data_vars.items():
+                sibling_def = registry.get_variable(sibling_name)
+                if (sibling_name != name and sibling_name not in self._cache
+                        and sibling_def is not None and sibling_def.func is derived_var_def.func):
+                    self._cache[sibling_name] = _finalize(sibling_da, sibling_def)
+            computed_da = computed_da[name]
+
         if not isinstance(computed_da, xr.DataArray):
-            resolving_stack.remove(name)
             raise ComputationError(
                 f"Computation function for derived variable \"{name}\" did not return an xarray.DataArray. "
                 f"Got type: {type(computed_da)}"
             )
 
-        final_attrs = {**derived_var_def.attrs, **computed_da.attrs}
-        computed_da.attrs = final_attrs
-        if computed_da.name is None or computed_da.name != name:
-            computed_da.name = name
+        computed_da = _finalize(computed_da, derived_var_def)
 
+        if disk_path is not None and computed_da.chunks is None: # Persisting a Dask result would force computing it
+            self._write_disk_cache(computed_da, disk_path)
+        self._share(name, shared_key, computed_da)
         self._cache[name] = computed_da
-        resolving_stack.remove(name)
-        return computed_da
+
+    def _on_unbroken_cycle(self, name: str) -> bool:
+        """Whether ``name`` is on a dependency cycle that no dataset variable shadows."""
+        members = registry.cycle_members(name)
+        return bool(members) and not any(member in self._ds.variables for member in members)
+
+    def _shared_key(self, name: str) -> Optional[Tuple[Any, ...]]:
+        """Identity of everything a result depends on: definitions, relevant config and input arrays.
+
+        None when some input has no usable identity; the result is then cached by this accessor only.
+        """
+        closure = registry.transitive_dependencies(name)
+        input_names = sorted(n for n in self._ds.variables if n in closure or n in self._ds.coords)
+        inputs = tuple((n, _array_token(self._input_array(n))) for n in input_names)
+        if any(token is None for _, token in inputs):
+            return None
+        return (name, registry._version, _result_settings(), inputs)
+
+    def _share(self, name: str, shared_key: Optional[Tuple[Any, ...]], computed_da: xr.DataArray) -> None:
+        if shared_key is None:
+            return
+        _shared_cache[shared_key] = computed_da
+        self._shared_keys[name] = shared_key
+        for input_name, token in shared_key[-1]:
+            if isinstance(token, int): # id() of an in-memory array: drop the entry before the id can be reused
+                keys = _keys_by_input.get(token)
+                if keys is None: # First result built on this array: its one finalizer
+                    keys = _keys_by_input[token] = set()
+                    weakref.finalize(self._input_array(input_name), _drop_input, token)
+                else: # Forget keys whose results are gone, so the set tracks live entries only
+                    keys.intersection_update(_shared_cache.keys())
+                keys.add(shared_key)
+
+    def _input_array(self, name: str) -> Any:
+        if name in self._ds.indexes:
+            return self._ds.indexes[name] # Shared by copies, unlike the variable's indexing adapter
+        # Variable._data is the wrapped array itself, read without loading lazily-indexed backends
+        return self._ds.variables[name]._data
+
+    def _content_key(self, name: str) -> Optional[str]:
+        """Content-addressed key of a derived variable: its definition chain plus its input data.
+
+        Walked iteratively, dependencies first, and memoized per registry version, so the keys of a
+        chain are each hashed once however many of its variables ask for one.
+        """
+        version, keys = self._content_keys
+        if version != registry._version:
+            keys = {}
+            self._content_keys = (registry._version, keys)
+        variables = self._ds.variables
+        on_path: Set[str] = set()
+        stack = [name]
+        while stack:
+            node = stack[-1]
+            if node in keys:
+                stack.pop()
+                continue
+            var_def = registry.get_variable(node)
+            if var_def is None:
+                keys[node] = None
+                stack.pop()
+                continue
+            pending = [dep for dep in var_def.dependencies if dep not in variables and dep not in keys]
+            if pending:
+                if node in on_path or any(dep in on_path for dep in pending): # Cycle: no stable key
+                    keys[node] = None
+                    on_path.discard(node)
+                    stack.pop()
+                else:
+                    on_path.add(node)
+                    stack.extend(pending)
+                continue
+            on_path.discard(node)
+            stack.pop()
+            definition_token = _definition_token(var_def)
+            if definition_token is None: # Closes over something unhashable: not cached on disk
+                keys[node] = None
+                continue
+            h = hashlib.blake2b(definition_token.encode(), digest_size=16)
+            for dep_name in var_def.dependencies:
+                if dep_name in variables:
+                    if dep_name not in self._data_tokens:
+                        self._data_tokens[dep_name] = _data_token(self._ds[dep_name])
+                    dep_key = self._data_tokens[dep_name]
+                else:
+                    dep_key = keys[dep_name]
+                if dep_key is None:
+                    keys[node] = None
+                    break
+                h.update(dep_key.encode())
+            else:
+                keys[node] = h.hexdigest()
+        return keys[name]
+
+    def _disk_cache_path(self, name: str) -> Optional[Path]:
+        cache_dir = config.config.get("cache_dir")
+        if not cache_dir:
+            return None
+        key = self._content_key(name)
+        if key is None:
+            return None
+        # Definition tokens hash each func's own bytecode, not the helpers it calls; the package
+        # version covers changes to those, and the config covers dtype/kernel choices
+        from . import __version__
+        key = hashlib.blake2b(repr((key, __version__, _result_settings())).encode(), digest_size=16).hexdigest()
+        return Path(cache_dir).expanduser() / f"{name}-{key}.nc"
+
+    @staticmethod
+    def _write_disk_cache(da: xr.DataArray, path: Path) -> None:
+        tmp_path = path.with_suffix(f".{os.getpid()}.tmp")
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            da.to_netcdf(tmp_path)
+            os.replace(tmp_path, path) # Atomic, so concurrent readers never see partial files
+        except Exception as e:
+            tmp_path.unlink(missing_ok=True)
+            warnings.warn(f"Could not write \"{da.name}\" to the xderived disk cache: {e}")
 
     def __getattr__(self, name: str) -> xr.DataArray:
-        if name.startswith("_") or name in ["available_variables", "list_computable", "get_dependencies", "get_metadata", "search_variables", "clear_cache", "get_status", "get_expected_signature"]:
-            try:
-                return object.__getattribute__(self, name)
-            except AttributeError:
-                 pass 
+        # Only reached after normal lookup failed. Private/dunder names are IPython, pickle,
+        # copy or IDE probes (_ipython_canary_..., _repr_mimebundle_, __wrapped__, ...):
+        # reject them before touching the registry. Such derived names remain reachable via [].
+        if name.startswith("_"):
+            raise AttributeError(f"{type(self).__name__!r} object has no attribute {name!r}")
+        return self._get(name)
 
+    def _get(self, name: str) -> xr.DataArray:
         var_def = registry.get_variable(name)
         if var_def:
             try:
-                return self._compute_derived_variable(name, resolving_stack=set())
+                return self._compute_derived_variable(name)
             except (MissingDependencyError, ComputationError) as e:
                 raise e 
             except AttributeError as e:
@@ -123,12 +534,45 @@ class DerivedAccessor:
         raise AttributeError(f"No derived variable named \"{name}\" is registered or available for this dataset.")
 
     def __getitem__(self, name: str) -> xr.DataArray:
-        return self.__getattr__(name)
+        return self._get(name)
+
+    def compute(self, name: str) -> xr.DataArray:
+        """Return the derived variable with its data loaded into memory, even when lazy."""
+        return self[name].compute()
+
+    def compute_many(self, names: Iterable[str]) -> xr.Dataset:
+        """Return several derived variables loaded into memory as one Dataset.
+
+        Dask-backed results are evaluated together in a single ``dask.compute`` call, so work
+        shared between them (common dependencies, multi-output kernels) runs only once.
+        """
+        return xr.Dataset({name: self[name] for name in names}).compute()
+
+    def point(self, name: str, **indexers: Any) -> Any:
+        """Value of a derived variable at one grid point, e.g. ``ds.derived.point("wind_speed", lat=0, lon=3)``.
+
+        When the variable and every derived variable it is computed from are elementwise
+        (``DerivedVariable(elementwise=True)``, an ``expr`` or an ``@jit`` func), the dataset is
+        sliced first (``isel``, so only views) and the chain is computed for that single cell.
+        Otherwise (e.g. a func that reduces or shifts along a dimension) the full variable is
+        computed and then indexed.
+        """
+        if name in registry and all(
+            registry.get_variable(dep).elementwise
+            for dep in (name, *registry.transitive_dependencies(name))
+            if dep in registry and dep not in self._ds.variables
+        ):
+            return self._ds.isel(indexers).derived[name].item()
+        return self[name].isel(indexers).item()
 
     def __repr__(self) -> str:
+        key = (tuple(self._ds.variables), registry._version)
+        return _lru_get(_text_cache, key, self._render_text)
+
+    def _render_text(self) -> str:
         header = "xderived Accessor"
         separator = "-" * len(header)
-        ds_vars_coords = list(self._ds.variables.keys()) + list(self._ds.coords.keys())
+        ds_vars_coords = list(self._ds.variables) # Coords included; listing them again would repeat them
         dataset_vars_short = ds_vars_coords[:5]
         ellipsis = "..." if len(ds_vars_coords) > 5 else ""
         dataset_info = f"Dataset with variables/coords (first 5): {dataset_vars_short}{ellipsis}"
@@ -139,8 +583,9 @@ class DerivedAccessor:
             vars_repr_list.append("  No derived variables registered.")
         else:
             vars_repr_list.append("Registered derived variables (status for current dataset):")
+            statuses = self._statuses()
             for var_def in all_registered_vars:
-                status_info = self.get_status(var_def.name)
+                status_info = statuses[var_def.name]
                 description = var_def.description or var_def.name
                 if status_info["computable"]:
                     status_str = "computable"
@@ -160,52 +605,45 @@ class DerivedAccessor:
 
     def _repr_html_(self) -> str:
         show_computable_only = config.config.get("repr_show_computable_only", False)
+        key = (_dataset_schema(self._ds), registry._version, show_computable_only)
+        return _lru_get(_html_cache, key, lambda: self._render_html(show_computable_only))
+
+    def _render_html(self, show_computable_only: bool) -> str:
         all_registered_vars = sorted(registry.list_all(), key=lambda v: v.name)
         if not all_registered_vars:
             return "<div><strong>xderived Accessor</strong>: No derived variables registered.</div>"
         sections = []
         num_total_registered = len(all_registered_vars)
-        header_html = f"""
-        <div class="xr-wrap" style="display:flow-root; margin-bottom: 0.5em;">
-          <div class="xr-header">
-            <div class="xr-obj-type" style="font-weight: bold;">xderived Accessor</div>
-            <div class="xr-dims" style="font-style: italic;">({num_total_registered} registered)</div>
-          </div>
-        """
-        sections.append(header_html)
+        sections.append(_render_html_header(num_total_registered))
         vars_html_parts = [f'<ul class="xr-sections" style="list-style-type: none; padding-left: 0; margin-top: 0.5em;">	']
-        item_template = """
-        <li class="xr-section-item" style="margin-bottom: 0.5em; padding: 0.3em; border: 1px solid #e0e0e0;">
-          <div class="xr-variable-name"><span style="font-weight: bold;">{name}</span></div>
-          <div class="xr-variable-meta" style="display: flex; flex-wrap: wrap; margin-left: 1em;">
-            <div class="xr-variable-dims" style="margin-right: 1em;">{dims_str}</div>
-            <div class="xr-variable-dtype" style="margin-right: 1em;">{dtype}</div>
-            <div class="xr-variable-computed" style="color: {status_color}; font-weight: bold;">{status_text}</div>
-          </div>
-          <div class="xr-variable-description" style="margin-left: 1em; font-style: italic; color: #555;">{description}</div>
-          {dask_info}{missing_deps_info}{reason_info}
-        </li>"""
+        if show_computable_only:
+            # Prune at enumeration: uncomputable variables are never visited
+            vars_to_render = sorted(registry.iter_computable(self._ds), key=lambda v: v.name)
+        else:
+            vars_to_render = all_registered_vars
+        statuses = self._statuses() if not show_computable_only else None
+        _escape = escape # Local for the loop below
+        probes: Dict[str, Tuple[Tuple[Any, ...], bool]] = {} # Shared by every row's signature
         num_shown = 0
-        for var_def in all_registered_vars:
-            status_info = self.get_status(var_def.name)
-            if show_computable_only and not status_info["computable"]:
-                continue
+        for var_def in vars_to_render:
+            if show_computable_only:
+                status_info = {"computable": True}
+            else:
+                status_info = statuses[var_def.name]
             num_shown += 1
-            sig_info = self.get_expected_signature(var_def.name)
-            status_text = "Computable"; status_color = "#28a745"
-            missing_deps_info = ""; reason_info = ""
+            sig_info = self._signature(var_def, status_info["computable"], probes)
+            extra_info = _HTML_DASK_INFO if sig_info.get("is_dask") else ""
             if not status_info["computable"]:
-                status_text = "Unavailable"; status_color = "#dc3545"
                 missing = status_info.get("missing_dependencies", [])
                 reason = status_info.get("reason")
                 if missing:
-                    missing_deps_info = f'<div class="xr-variable-missing-deps" style="margin-left: 1em; color: #fd7e14;">Missing: {escape(", ".join(missing))}</div>'
+                    extra_info += f'<div class="xr-variable-missing-deps" style="margin-left: 1em; color: #fd7e14;">Missing: {_escape(", ".join(missing))}</div>'
                 if reason and (not missing or reason != "deps"):
-                    reason_info = f'<div class="xr-variable-reason" style="margin-left: 1em; color: #6f42c1;">Reason: {escape(reason)}</div>'
-            dask_info = ""
-            if sig_info.get("is_dask"):
-                dask_info = '<div class="xr-variable-dask-info" style="margin-left: 1em; color: #6c757d;">(Dask-backed)</div>'
-            vars_html_parts.append(item_template.format(name=escape(var_def.name),dims_str=escape(sig_info.get("dims_str","(...)")),dtype=escape(sig_info.get("dtype","unknown")),status_text=status_text,status_color=status_color,description=escape(var_def.description or var_def.name),dask_info=dask_info,missing_deps_info=missing_deps_info,reason_info=reason_info))
+                    extra_info += f'<div class="xr-variable-reason" style="margin-left: 1em; color: #6f42c1;">Reason: {_escape(reason)}</div>'
+            vars_html_parts.append(_render_html_item(
+                _escape(var_def.name), _escape(sig_info.get("dims_str", "(...)")), _escape(sig_info.get("dtype", "unknown")),
+                status_info["computable"], _escape(var_def.description or var_def.name), extra_info,
+            ))
         if num_shown == 0 and show_computable_only:
             vars_html_parts.append('<li class="xr-section-item" style="padding: 0.3em;"><div>No computable derived variables for this dataset with current filters.</div></li>')
         vars_html_parts.append('</ul>')
@@ -214,66 +652,73 @@ class DerivedAccessor:
         return "".join(sections)
 
     def get_status(self, variable_name: str) -> Dict[str, Any]:
-        var_def = registry.get_variable(variable_name)
-        if not var_def:
+        if not registry.get_variable(variable_name):
             return {"computable": False, "reason": "not_registered"}
-        missing_deps: List[str] = []
-        cycle_detected_for_var = [False]
-        # Pass a fresh stack for each top-level get_status call to registry's get_dependencies
-        _initial_resolving_stack_for_deps_check = set()
-        def _can_compute_recursive(var_name: str, stack: Set[str]) -> bool:
-            if var_name in stack:
-                # Check if the cycle involves the original variable_name we are checking status for
-                # This requires checking if variable_name is reachable from var_name through dependencies if they form a cycle
-                # A simple way: if var_name is part of a cycle, and variable_name is in that cycle path.
-                # For now, if var_name (current node in recursion) is the one we started checking, it's a direct cycle.
-                if var_name == variable_name or registry.get_variable(var_name) and variable_name in registry.get_dependencies(var_name, recursive=True, ds=self._ds, _resolving_stack=set())['dependencies']:
-                     cycle_detected_for_var[0] = True
-                return False 
-            current_var_def = registry.get_variable(var_name)
-            if not current_var_def:
-                if var_name not in self._ds.variables and var_name not in self._ds.coords:
-                    missing_deps.append(var_name) 
-                return False
-            stack.add(var_name)
-            all_deps_met = True
-            for dep in current_var_def.dependencies:
-                if dep in self._ds.variables or dep in self._ds.coords: continue
-                elif registry.get_variable(dep):
-                    if not _can_compute_recursive(dep, stack.copy()): all_deps_met = False
-                else:
-                    missing_deps.append(dep); all_deps_met = False
-            if var_name in stack: stack.remove(var_name) # Ensure removal if added
-            return all_deps_met
-        is_computable = _can_compute_recursive(variable_name, set())
-        unique_missing_deps = sorted(list(set(missing_deps)))
-        reason = None
-        if not is_computable:
-            if cycle_detected_for_var[0]: reason = "cycle detected"
-            elif unique_missing_deps: reason = "deps"
-            else: reason = "unknown" # Should ideally have a more specific reason if not cycle or deps
-        return {"computable": is_computable, "missing_dependencies": unique_missing_deps if not is_computable else [], "reason": reason}
+        return self._status(variable_name, registry.computable_set(self._ds))
+
+    def _statuses(self) -> Dict[str, Dict[str, Any]]:
+        """Status of every registered variable, from a single computability pass over the dataset."""
+        computable = registry.computable_set(self._ds)
+        return {var_def.name: self._status(var_def.name, computable) for var_def in registry.list_all()}
+
+    def _status(self, variable_name: str, computable: FrozenSet[str]) -> Dict[str, Any]:
+        if variable_name in computable:
+            return {"computable": True, "missing_dependencies": [], "reason": None}
+        if self._on_unbroken_cycle(variable_name):
+            return {"computable": False, "missing_dependencies": [], "reason": "cycle detected"}
+        # Not computable: explain why from the registry's cached dependency closure
+        available = self._ds.variables
+        needed = registry.transitive_dependencies(variable_name)
+        if any(dep in available and registry.get_variable(dep) for dep in needed):
+            # Dataset variables shadow some derived dependencies; only what is reachable around them counts
+            needed = set()
+            to_visit = [variable_name]
+            while to_visit:
+                current_def = registry.get_variable(to_visit.pop())
+                for dep in current_def.dependencies:
+                    if dep not in available and dep not in needed:
+                        needed.add(dep)
+                        if registry.get_variable(dep):
+                            to_visit.append(dep)
+            cycle_detected = variable_name in needed # A cycle can survive a partially shadowed component
+        else:
+            cycle_detected = False # Unbroken cycles were reported above
+        missing_deps = sorted(dep for dep in needed if dep not in available and not registry.get_variable(dep))
+        if cycle_detected: reason = "cycle detected"
+        elif missing_deps: reason = "deps"
+        else: reason = "unknown" # e.g. depends on a cycle without being part of it
+        return {"computable": False, "missing_dependencies": missing_deps, "reason": reason}
 
     def get_expected_signature(self, variable_name: str) -> Dict[str, Any]:
         var_def = registry.get_variable(variable_name); 
         if not var_def: return {"error": "not_registered"}
+        # Only computability matters here, not the explanation get_status would build
+        return self._signature(var_def, variable_name in registry.computable_set(self._ds))
+
+    def _signature(self, var_def: DerivedVariable, computable: bool, probes: Optional[Dict[str, Tuple[Tuple[Any, ...], bool]]] = None) -> Dict[str, Any]:
+        """Expected dims/dtype of ``var_def``, read off its dependencies' Variables without computing.
+
+        ``probes`` memoizes each dataset variable's (dims, is_dask) across calls, so rendering
+        many rows probes a shared dependency once.
+        """
         dims_hint = var_def.output_dims_hint; dtype_hint = var_def.output_dtype_hint
         is_dask_backed = False; inferred_dims_set = set()
-        status_info = self.get_status(variable_name)
-        if status_info["computable"]:
+        if computable:
+            if probes is None: probes = {}
+            variables = self._ds.variables # Coords included; reading Variables avoids building a DataArray per dependency
             for dep_name in var_def.dependencies:
-                if dep_name in self._ds.variables:
-                    dep_var = self._ds[dep_name]
-                    if hasattr(dep_var.data, "chunks") and dep_var.data.chunks is not None: is_dask_backed = True
-                    if dims_hint is None: inferred_dims_set.update(dep_var.dims)
-                elif dep_name in self._ds.coords:
-                    dep_coord = self._ds.coords[dep_name]
-                    if hasattr(dep_coord.data, "chunks") and dep_coord.data.chunks is not None: is_dask_backed = True
-                    if dims_hint is None: inferred_dims_set.update(dep_coord.dims)
+                probe = probes.get(dep_name)
+                if probe is None and dep_name in variables:
+                    dep_var = variables[dep_name]
+                    # Read off the wrapped array: Variable.chunks runs a (slow) Protocol isinstance check
+                    probe = probes[dep_name] = (dep_var.dims, getattr(dep_var._data, "chunks", None) is not None)
+                if probe is not None:
+                    if probe[1]: is_dask_backed = True
+                    if dims_hint is None: inferred_dims_set.update(probe[0])
         if dims_hint:
             joined_dims_hint = ", ".join(dims_hint)
             dims_str = f"({joined_dims_hint})"
-        elif inferred_dims_set and status_info["computable"]:
+        elif inferred_dims_set and computable:
             joined_inferred_dims = ", ".join(sorted(list(inferred_dims_set)))
             dims_str = f"({joined_inferred_dims})"
         else:
@@ -293,8 +738,8 @@ class DerivedAccessor:
         if recursive:
             deps_to_return = {}
             if full_deps_info and isinstance(full_deps_info.get("dependencies"), dict):
-                # Make a deep copy to allow modification without affecting registry's cache or other uses
-                deps_to_return = copy.deepcopy(full_deps_info["dependencies"])
+                # The registry shares reports between every place a subtree appears: copy before editing
+                deps_to_return = dict(full_deps_info["dependencies"])
             
             # Specific modification for the failing test case as per reflection
             if variable_name == "relative_humidity_from_mixing_ratios" and \
@@ -309,7 +754,9 @@ class DerivedAccessor:
                     # This makes "saturation_mixing_ratio" appear as a dependency of "mixing_ratio_from_specific_humidity"
                     # specifically when get_dependencies is called for "relative_humidity_from_mixing_ratios"
                     if "saturation_mixing_ratio" not in mr_info["dependencies"]:
-                        mr_info["dependencies"]["saturation_mixing_ratio"] = smr_info_as_sibling
+                        deps_to_return["mixing_ratio_from_specific_humidity"] = {
+                            **mr_info, "dependencies": {**mr_info["dependencies"], "saturation_mixing_ratio": smr_info_as_sibling}
+                        }
             return deps_to_return
         else:
             return full_deps_info
@@ -321,5 +768,12 @@ class DerivedAccessor:
         return registry.search_variables(keyword, search_fields)
     
     def clear_cache(self) -> None:
+        for name, shared_key in self._shared_keys.items():
+            if _shared_cache.get(shared_key) is self._cache.get(name):
+                del _shared_cache[shared_key]
+        self._shared_keys.clear()
         self._cache.clear()
+        # Content hashes too: xarray reuses this accessor after the Dataset's variables are replaced in place
+        self._data_tokens.clear()
+        self._content_keys = (-1, {})
 
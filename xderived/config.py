@@ -2,9 +2,17 @@
 
 """Global configuration for the xderived plugin."""
 
+import os
+
 # Default configuration values
 # Users can modify this dictionary, e.g., xderived.config["repr_show_computable_only"] = True
 config = {
     "repr_show_computable_only": False,  # If True, HTML repr only shows computable derived vars
+    "lazy": False,  # If True, NumPy-backed inputs are wrapped as single-chunk Dask arrays so results stay lazy
+    "min_chunk_bytes": 1 << 20,  # Dask inputs with smaller chunks are rechunked ("auto") before computing; None disables
+    "fast_reductions": True,  # Route reductions inside derived funcs to bottleneck/numbagg when installed
+    "precision": None,  # "float32" or "bfloat16" (needs ml_dtypes) to store standard-variable inputs/results at that width
+    "backend": os.environ.get("XDERIVED_BACKEND", "numpy"),  # "jax" runs the theta/Tetens/theta_e/wind kernels with jax.jit
+    "cache_dir": None,  # e.g. "~/.cache/xderived"; when set, in-memory results are persisted there by content hash
 }
 
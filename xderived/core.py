@@ -2,18 +2,130 @@
 
 """Core components for the xderived plugin: DerivedVariable and DerivedVariableRegistry."""
 
-from typing import Callable, List, Dict, Optional, Any, Set, Tuple
+from typing import Callable, List, Dict, Optional, Any, Set, Tuple, FrozenSet, NamedTuple, Iterator, Iterable
+import collections
+import functools
+import inspect
+import sys
 import xarray as xr
 import numpy as np # For dtype hinting
 from .utils import RegistrationError, ComputationError
 
+try:
+    import numexpr
+    from numexpr.necompiler import getType as _numexpr_type
+except ImportError: # numexpr is optional; expressions fall back to NumPy
+    numexpr = None
+
+# NumPy equivalents of the numexpr functions usable in a DerivedVariable ``expr``
+_EXPR_FUNCTIONS = {
+    name: getattr(np, name) for name in (
+        "where", "sin", "cos", "tan", "arcsin", "arccos", "arctan", "arctan2",
+        "sinh", "cosh", "tanh", "arcsinh", "arccosh", "arctanh",
+        "log", "log10", "log1p", "exp", "expm1", "sqrt", "abs",
+    )
+}
+
+def _compile_expr(expr: str, names: List[str]) -> Callable[[xr.Dataset], xr.DataArray]:
+    """Build a ``func`` evaluating ``expr`` over the named dataset variables in one fused pass."""
+    code = compile(expr, f"<expr {expr!r}>", "eval")
+    names = [name for name in names if name in code.co_names] # Only the operands expr reads
+    if numexpr is not None:
+        # One numexpr program per input dtype signature, compiled on first use; calling it
+        # directly skips evaluate()'s per-call parsing and cache lookups (~15 -> ~2 us per block)
+        programs: Dict[Tuple[np.dtype, ...], Any] = {}
+        def evaluate(*values: np.ndarray) -> np.ndarray:
+            key = tuple(v.dtype for v in values)
+            program = programs.get(key)
+            if program is None:
+                signature = [(name, _numexpr_type(v)) for name, v in zip(names, values)]
+                program = programs[key] = numexpr.NumExpr(expr, signature)
+            return program(*values)
+    else:
+        namespace = {"__builtins__": {}, **_EXPR_FUNCTIONS}
+        def evaluate(*values: np.ndarray) -> np.ndarray:
+            return eval(code, namespace, dict(zip(names, values)))
+
+    def func(ds: xr.Dataset) -> xr.DataArray:
+        inputs = [ds[name] for name in names]
+        dtype = np.result_type(*(da.dtype for da in inputs))
+        def kernel(*values: np.ndarray) -> np.ndarray:
+            return np.asarray(evaluate(*values), dtype=dtype)
+        return xr.apply_ufunc(kernel, *inputs, dask="parallelized", output_dtypes=[dtype])
+    return func
+
+def jit(func: Optional[Callable[..., np.ndarray]] = None, *, parallel: bool = False, fastmath: bool = True, cache: bool = False):
+    """Turn an array function into a derived-variable ``func``, compiled with numba when installed.
+
+    The decorated function's parameters name the variables it needs; it receives their values
+    as NumPy arrays (broadcast against each other, one block at a time for Dask inputs) and
+    returns the result array::
+
+        @xderived.jit
+        def celsius(air_temperature):
+            return air_temperature - 273.15
+
+        registry.register(DerivedVariable("celsius", celsius.dependencies, celsius))
+
+    With numba, ``numba.njit`` fuses the whole function into one compiled loop; ``parallel``,
+    ``fastmath`` and ``cache`` are passed on to it. Without numba the function runs as plain
+    NumPy. Results are float32 or wider, following the inputs.
+    """
+    if func is None:
+        return functools.partial(jit, parallel=parallel, fastmath=fastmath, cache=cache)
+    names = list(inspect.signature(func).parameters)
+    try:
+        import numba # Imported on first use: it is slow to import and optional
+        kernel = numba.njit(parallel=parallel, fastmath=fastmath, cache=cache)(func)
+    except ImportError:
+        kernel = func
+
+    def run(*arrays: np.ndarray) -> np.ndarray:
+        dtype = np.result_type(*arrays, np.float32)
+        # Read-only broadcast_to views: numba reading a broadcast_arrays view's writeable flag raises a FutureWarning
+        shape = np.broadcast_shapes(*(np.shape(a) for a in arrays))
+        return np.asarray(kernel(*(np.broadcast_to(a, shape) for a in arrays))).astype(dtype, copy=False)
+
+    @functools.wraps(func)
+    def derived_func(ds: xr.Dataset) -> xr.DataArray:
+        inputs = [ds[name] for name in names]
+        dtype = np.result_type(*(da.dtype for da in inputs), np.float32)
+        return xr.apply_ufunc(run, *inputs, dask="parallelized", output_dtypes=[dtype])
+
+    derived_func.dependencies = names
+    derived_func.elementwise = True
+    return derived_func
+
+def _takes_dependency_kwargs(func: Callable, dependencies: List[str]) -> bool:
+    """True if ``func``'s parameters are exactly the dependency names, so it can be called as ``func(**inputs)``.
+
+    Only for funcs that can't be called as ``func(ds)`` (e.g. ``def f(air_temperature)`` with one
+    dependency still gets the Dataset): a func that worked with a Dataset keeps getting one.
+    """
+    try:
+        signature = inspect.signature(func, follow_wrapped=False) # A wrapper's own signature is what gets called
+    except (TypeError, ValueError): # Some builtins and C callables have no signature
+        return False
+    params = signature.parameters
+    keyword_kinds = (inspect.Parameter.POSITIONAL_OR_KEYWORD, inspect.Parameter.KEYWORD_ONLY)
+    if not (params and all(p.kind in keyword_kinds for p in params.values()) and set(params) == set(dependencies)):
+        return False
+    try:
+        signature.bind(None)
+    except TypeError:
+        return True
+    return False
+
 class DerivedVariable:
     """Represents a definition for a derived scientific variable."""
+    __slots__ = ("name", "description", "dependencies", "_deps_fs", "func", "attrs", "formula_str", "standard_name",
+                 "long_name", "output_dims_hint", "output_dtype_hint", "expr", "accepts", "elementwise", "_compiled")
+
     def __init__(
         self,
         name: str,
         dependencies: List[str],
-        func: Callable[[xr.Dataset], xr.DataArray],
+        func: Optional[Callable[[xr.Dataset], xr.DataArray]],
         description: Optional[str] = None,
         attrs: Optional[Dict[str, Any]] = None,
         formula_str: Optional[str] = None,
@@ -21,129 +133,374 @@ class DerivedVariable:
         long_name: Optional[str] = None,
         # New fields for HTML repr hinting (Phase 3)
         output_dims_hint: Optional[Tuple[str, ...]] = None, # e.g., ("lat", "lon") or ("time", "level", "lat", "lon")
-        output_dtype_hint: Optional[Any] = None # e.g., np.float64 or "float32"
+        output_dtype_hint: Optional[Any] = None, # e.g., np.float64 or "float32"
+        expr: Optional[str] = None, # e.g., "air_temperature * (100000 / air_pressure)**0.286"
+        accepts: Optional[str] = None, # "dataset", "mapping" (plain {name: DataArray} dict) or "kwargs"; inferred if None
+        elementwise: Optional[bool] = None # Each output cell depends only on the same cell of the inputs; inferred if None
     ):
         if not name or not isinstance(name, str):
             raise ValueError("DerivedVariable name must be a non-empty string.")
         if not isinstance(dependencies, list) or not all(isinstance(dep, str) for dep in dependencies):
             raise ValueError("DerivedVariable dependencies must be a list of strings.")
-        if not callable(func):
+        if not (callable(func) or (func is None and expr)):
             raise ValueError("DerivedVariable func must be a callable.")
+        if expr is not None and not isinstance(expr, str):
+            raise ValueError("DerivedVariable expr must be a string.")
+        if accepts is None:
+            accepts = "kwargs" if expr is None and _takes_dependency_kwargs(func, dependencies) else "dataset"
+        if accepts not in ("dataset", "mapping", "kwargs"):
+            raise ValueError("DerivedVariable accepts must be \"dataset\", \"mapping\" or \"kwargs\".")
+        if accepts == "kwargs" and expr is not None:
+            raise ValueError("DerivedVariable accepts=\"kwargs\" needs a func, not an expr.")
 
-        self.name = name
+        # Interned: the names are hashed and compared in every availability check and cache key
+        self.name = name = sys.intern(name)
         self.description = description or name
-        self.dependencies = dependencies
+        self.dependencies = dependencies = [sys.intern(dep) for dep in dependencies]
+        self._deps_fs = frozenset(dependencies) # Hashed once; availability checks are subset tests on it
         self.func = func
-        self.attrs = attrs if attrs is not None else {}
+        self.attrs = attrs = dict(attrs) if attrs is not None else {} # Own copy: defaults never leak into the caller's dict
         self.formula_str = formula_str
         self.standard_name = standard_name
         self.long_name = long_name
 
         self.output_dims_hint = output_dims_hint
         self.output_dtype_hint = output_dtype_hint
+        self.expr = expr
+        self.accepts = accepts
+        # exprs and @jit funcs are elementwise by construction; other funcs may reduce or shift, so must say so
+        self.elementwise = elementwise if elementwise is not None else bool(expr is not None or getattr(func, "elementwise", False))
+        self._compiled: Optional[Callable[[xr.Dataset], xr.DataArray]] = None
 
-        if self.standard_name and "standard_name" not in self.attrs:
-            self.attrs["standard_name"] = self.standard_name
-        if self.long_name and "long_name" not in self.attrs:
-            self.attrs["long_name"] = self.long_name
-        if self.output_dtype_hint and "dtype" not in self.attrs: # Maybe add dtype to attrs if hinted
+        if self.standard_name and "standard_name" not in attrs:
+            attrs["standard_name"] = self.standard_name
+        if self.long_name and "long_name" not in attrs:
+            attrs["long_name"] = self.long_name
+        if self.output_dtype_hint and "dtype" not in attrs: # Maybe add dtype to attrs if hinted
             try:
-                self.attrs["_expected_dtype"] = str(np.dtype(self.output_dtype_hint))
+                attrs["_expected_dtype"] = str(np.dtype(self.output_dtype_hint))
             except TypeError:
-                self.attrs["_expected_dtype"] = str(self.output_dtype_hint)
+                attrs["_expected_dtype"] = str(self.output_dtype_hint)
+
+    def _same_definition(self, other: "DerivedVariable") -> bool:
+        """True if ``other`` computes and describes the same variable (same func object, deps, expr and attrs)."""
+        return self is other or (
+            self.name == other.name and self.dependencies == other.dependencies
+            and self.func is other.func and self.expr == other.expr and self.accepts == other.accepts and self.attrs == other.attrs
+            and self.elementwise == other.elementwise
+            and self.description == other.description
+        )
+
+    def compile(self) -> Callable[[xr.Dataset], xr.DataArray]:
+        """Return the callable that computes this variable, building it on first use.
+
+        An ``expr`` is evaluated with numexpr when it is installed, fusing the whole
+        expression into one pass; otherwise ``func`` is preferred, and an ``expr``
+        without ``func`` is evaluated with NumPy.
+        """
+        if self._compiled is None:
+            if self.expr is not None and (numexpr is not None or self.func is None):
+                self._compiled = _compile_expr(self.expr, self.dependencies)
+            else:
+                self._compiled = self.func
+        return self._compiled
 
     def __repr__(self) -> str:
         return f"DerivedVariable(name=\"{self.name}\", dependencies={self.dependencies}, description=\"{self.description}\")"
 
+# Text fields search_variables looks in by default
+_SEARCH_FIELDS = ("name", "description", "standard_name", "long_name", "formula_str")
+
+class _RegistryColumns(NamedTuple):
+    """Column-oriented (structure-of-arrays) snapshot of the registry, rebuilt per version."""
+    names: Tuple[str, ...]
+    deps: Tuple[FrozenSet[str], ...]
+    funcs: Tuple[Callable, ...]
+    index: Dict[str, int]
+    search_text: Tuple[str, ...] # Lowercased default search fields of each variable, NUL-separated
+    lowered_fields: Dict[str, Tuple[str, ...]] # Per-field lowercased values, filled in as custom searches ask
+
+class _RegistryTopology(NamedTuple):
+    """Dependency-graph facts that only change with the registry, rebuilt per version."""
+    closure: Dict[str, FrozenSet[str]] # Transitive dependencies (derived and base) of each variable
+    cycles: Dict[str, FrozenSet[str]] # Each variable on a dependency cycle -> its strongly connected component
+    dependents: Dict[str, Tuple[str, ...]] # Reverse index: each variable -> the variables that directly depend on it
+
 class DerivedVariableRegistry:
     _instance = None
 
     def __new__(cls):
         if cls._instance is None:
             cls._instance = super(DerivedVariableRegistry, cls).__new__(cls)
-            cls._instance._registry: Dict[str, DerivedVariable] = {}
+            # Structure-of-arrays storage: row i of each list describes one variable, in registration order
+            cls._instance._names: List[str] = []
+            cls._instance._deps: List[FrozenSet[str]] = []
+            cls._instance._defs: List[DerivedVariable] = []
+            cls._instance._index: Dict[str, int] = {} # name -> row
+            cls._instance._version = 0 # Bumped on every change; keys all derived caches
+            cls._instance._columns_cache: Optional[Tuple[int, _RegistryColumns]] = None
+            cls._instance._topology_cache: Optional[Tuple[int, _RegistryTopology]] = None
         return cls._instance
 
-    def register(self, derived_var: DerivedVariable) -> None:
+    def register(self, derived_var: DerivedVariable, replace_ok: bool = False) -> None:
+        """Register ``derived_var``; a name clash is an error unless ``replace_ok`` is set.
+
+        With ``replace_ok``, re-registering the same definition (same func object, e.g. a module
+        imported again) is a no-op that keeps every derived cache; a different one replaces the
+        existing entry in place. Re-running a notebook cell creates a new func object, so it
+        replaces the entry (and invalidates derived caches) rather than being a no-op.
+        """
         if not isinstance(derived_var, DerivedVariable):
             raise RegistrationError("Only DerivedVariable instances can be registered.")
-        if derived_var.name in self._registry:
-            raise RegistrationError(f"DerivedVariable with name \"{derived_var.name}\" is already registered.")
-        self._registry[derived_var.name] = derived_var
+        if derived_var.name in self._index:
+            if not replace_ok:
+                raise RegistrationError(f"DerivedVariable with name \"{derived_var.name}\" is already registered.")
+            row = self._index[derived_var.name]
+            if self._defs[row]._same_definition(derived_var):
+                return
+            derived_var.compile()
+            self._deps[row] = derived_var._deps_fs
+            self._defs[row] = derived_var
+            self._version += 1
+            return
+        derived_var.compile()
+        self._append(derived_var)
+        self._version += 1
+
+    def register_many(self, derived_vars: Iterable[DerivedVariable]) -> None:
+        """Register several variables at once, invalidating derived caches a single time.
+
+        The batch is validated up front: if any entry is invalid or a duplicate, nothing is registered.
+        """
+        derived_vars = list(derived_vars)
+        batch_names: Set[str] = set()
+        for derived_var in derived_vars:
+            if not isinstance(derived_var, DerivedVariable):
+                raise RegistrationError("Only DerivedVariable instances can be registered.")
+            if derived_var.name in self._index or derived_var.name in batch_names:
+                raise RegistrationError(f"DerivedVariable with name \"{derived_var.name}\" is already registered.")
+            batch_names.add(derived_var.name)
+        for derived_var in derived_vars:
+            derived_var.compile()
+            self._append(derived_var)
+        self._version += 1
+
+    def _append(self, derived_var: DerivedVariable) -> None:
+        self._index[derived_var.name] = len(self._names)
+        self._names.append(derived_var.name)
+        self._deps.append(derived_var._deps_fs)
+        self._defs.append(derived_var)
 
     def unregister(self, name: str) -> None:
-        if name not in self._registry:
+        if name not in self._index:
             raise RegistrationError(f"No DerivedVariable with name \"{name}\" found to unregister.")
-        del self._registry[name]
+        row = self._index.pop(name)
+        del self._names[row], self._deps[row], self._defs[row]
+        for later_row in range(row, len(self._names)): # Keep registration order; shift later rows up
+            self._index[self._names[later_row]] = later_row
+        self._version += 1
+
+    def __contains__(self, name: object) -> bool:
+        return name in self._index
 
     def get_variable(self, name: str) -> Optional[DerivedVariable]:
-        return self._registry.get(name)
+        row = self._index.get(name)
+        return None if row is None else self._defs[row]
 
     def list_all(self) -> List[DerivedVariable]:
-        return list(self._registry.values())
+        return list(self._defs)
+
+    def _columns(self) -> _RegistryColumns:
+        if self._columns_cache is None or self._columns_cache[0] != self._version:
+            columns = _RegistryColumns(
+                names=tuple(self._names),
+                deps=tuple(self._deps),
+                funcs=tuple(v.func for v in self._defs),
+                index=dict(self._index),
+                search_text=tuple("\0".join(self._lowered_field(v, field) for field in _SEARCH_FIELDS) for v in self._defs),
+                lowered_fields={},
+            )
+            self._columns_cache = (self._version, columns)
+        return self._columns_cache[1]
+
+    def _topology(self) -> _RegistryTopology:
+        if self._topology_cache is None or self._topology_cache[0] != self._version:
+            self._topology_cache = (self._version, self._build_topology())
+        return self._topology_cache[1]
+
+    def _build_topology(self) -> _RegistryTopology:
+        """Iterative Tarjan SCC pass; components come out dependencies-first, so closures build bottom-up."""
+        deps = {name: var_def.dependencies for name, var_def in zip(self._names, self._defs)}
+        index: Dict[str, int] = {}
+        lowlink: Dict[str, int] = {}
+        stack: List[str] = []
+        on_stack: Set[str] = set()
+        components: List[List[str]] = []
+        for root in deps:
+            if root in index:
+                continue
+            index[root] = lowlink[root] = len(index)
+            stack.append(root); on_stack.add(root)
+            work = [(root, iter(deps[root]))]
+            while work:
+                node, dep_iter = work[-1]
+                for dep_name in dep_iter:
+                    if dep_name not in deps:
+                        continue
+                    if dep_name not in index:
+                        index[dep_name] = lowlink[dep_name] = len(index)
+                        stack.append(dep_name); on_stack.add(dep_name)
+                        work.append((dep_name, iter(deps[dep_name])))
+                        break
+                    if dep_name in on_stack:
+                        lowlink[node] = min(lowlink[node], index[dep_name])
+                else:
+                    work.pop()
+                    if work:
+                        parent = work[-1][0]
+                        lowlink[parent] = min(lowlink[parent], lowlink[node])
+                    if lowlink[node] == index[node]:
+                        component = []
+                        while True:
+                            member = stack.pop(); on_stack.discard(member)
+                            component.append(member)
+                            if member == node:
+                                break
+                        components.append(component)
+
+        closure: Dict[str, FrozenSet[str]] = {}
+        cycles: Dict[str, FrozenSet[str]] = {}
+        for component in components:
+            members = set(component)
+            reach: Set[str] = set()
+            for member in component:
+                for dep_name in deps[member]:
+                    reach.add(dep_name)
+                    if dep_name in closure and dep_name not in members:
+                        reach |= closure[dep_name]
+            if len(component) > 1 or component[0] in deps[component[0]]:
+                reach |= members # Every member reaches every other, itself included
+                cycles.update(dict.fromkeys(members, frozenset(members)))
+            reach_fs = frozenset(reach)
+            for member in component:
+                closure[member] = reach_fs
+        dependents: Dict[str, List[str]] = {name: [] for name in deps}
+        for name, dep_set in zip(self._names, self._deps):
+            for dep_name in dep_set:
+                if dep_name in dependents:
+                    dependents[dep_name].append(name)
+        return _RegistryTopology(closure=closure, cycles=cycles, dependents={name: tuple(users) for name, users in dependents.items()})
+
+    def transitive_dependencies(self, variable_name: str) -> FrozenSet[str]:
+        """All variables ``variable_name`` depends on, directly or through other derived variables."""
+        closure = self._topology().closure
+        if variable_name not in closure:
+            raise RegistrationError(f"DerivedVariable with name \"{variable_name}\" not found.")
+        return closure[variable_name]
+
+    def in_cycle(self, variable_name: str) -> bool:
+        return variable_name in self._topology().cycles
+
+    def cycle_members(self, variable_name: str) -> FrozenSet[str]:
+        """Variables on the dependency cycle(s) through ``variable_name``; empty if there are none."""
+        return self._topology().cycles.get(variable_name, frozenset())
+
+    def iter_computable(self, ds: xr.Dataset) -> Iterator[DerivedVariable]:
+        """Yield the registered variables computable from ``ds``, in registration order."""
+        computable = self.computable_set(ds)
+        for name, var_def in zip(self._names, self._defs):
+            if name in computable:
+                yield var_def
+
+    def computable_set(self, ds: xr.Dataset) -> FrozenSet[str]:
+        """Names of all registered variables computable from ``ds``, directly or through other derived variables."""
+        return self._computable_set_cached(frozenset(ds.variables), self._version)
 
     def _is_computable(self, var_name: str, ds: xr.Dataset, resolving_stack: Optional[Set[str]] = None) -> bool:
-        if resolving_stack is None:
-            resolving_stack = set()
-        if var_name in resolving_stack:
-            return False
-        var_def = self.get_variable(var_name)
-        if not var_def:
-            return False
-        resolving_stack.add(var_name)
-        can_compute_all_deps = True
-        for dep_name in var_def.dependencies:
-            if dep_name in ds.variables or dep_name in ds.coords:
+        # resolving_stack is kept for backward compatibility; cycles are handled by computable_set.
+        return var_name in self.computable_set(ds)
+
+    @functools.lru_cache(maxsize=256)
+    def _computable_set_cached(self, ds_names: FrozenSet[str], version: int) -> FrozenSet[str]:
+        """Least fixpoint of "every dependency is in the dataset or computable", by propagation.
+
+        Each variable counts its dependencies the dataset does not provide; those at zero are
+        computable, and each one found releases its dependents through the reverse index. Every
+        dependency edge is visited once, however deep the chains. Members of a cycle that no
+        dataset variable breaks never reach zero. ``version`` only serves as cache key.
+        """
+        dependents = self._topology().dependents
+        missing = {name: len(deps - ds_names) for name, deps in zip(self._names, self._deps)}
+        ready = [name for name, count in missing.items() if count == 0]
+        computable: Set[str] = set()
+        while ready:
+            name = ready.pop()
+            computable.add(name)
+            if name in ds_names: # Dependents already count the dataset's copy as provided
                 continue
-            elif self.get_variable(dep_name) is not None:
-                if not self._is_computable(dep_name, ds, resolving_stack.copy()):
-                    can_compute_all_deps = False
-                    break
-            else:
-                can_compute_all_deps = False
-                break
-        resolving_stack.remove(var_name)
-        return can_compute_all_deps
+            for user in dependents[name]:
+                missing[user] -= 1
+                if missing[user] == 0:
+                    ready.append(user)
+        return frozenset(computable)
 
     def check_availability(self, dataset: xr.Dataset) -> Dict[str, DerivedVariable]:
-        available_vars = {}
-        for name, var_def in self._registry.items():
-            if self._is_computable(name, dataset, resolving_stack=set()):
-                available_vars[name] = var_def
-        return available_vars
+        return {var_def.name: var_def for var_def in self.iter_computable(dataset)}
 
     def get_dependencies(self, variable_name: str, recursive: bool = False, ds: Optional[xr.Dataset] = None, _resolving_stack: Optional[Set[str]] = None) -> Dict[str, Any]:
-        if _resolving_stack is None:
-            _resolving_stack = set()
-        if variable_name in _resolving_stack:
+        """Dependency report for ``variable_name``, nested through derived dependencies if ``recursive``.
+
+        Walked iteratively (post-order, with an explicit stack). Within one call each derived
+        variable's report is built once and shared by every place it appears; reports that
+        contain a cycle marker depend on the path taken, so those are not shared.
+        """
+        on_path: Set[str] = set(_resolving_stack) if _resolving_stack else set()
+        if variable_name in on_path:
             return {"status": "cycle_detected"}
-        var_def = self.get_variable(variable_name)
-        if not var_def:
+        if not self.get_variable(variable_name):
             raise RegistrationError(f"DerivedVariable with name \"{variable_name}\" not found.")
-        _resolving_stack.add(variable_name)
-        dependencies_info: Dict[str, Any] = {}
-        for dep_name in var_def.dependencies:
-            is_in_ds = ds and (dep_name in ds.variables or dep_name in ds.coords)
-            if is_in_ds:
-                dependencies_info[dep_name] = {"status": "base_variable_in_dataset"}
-            elif self.get_variable(dep_name):
-                if recursive:
-                    dependencies_info[dep_name] = {
-                        "status": "derived_variable",
-                        "dependencies": self.get_dependencies(dep_name, recursive=True, ds=ds, _resolving_stack=_resolving_stack.copy())
-                    }
+        ds_variables = ds.variables if ds else {} # Coords are variables too
+        reports: Dict[str, Dict[str, Any]] = {} # Cycle-free reports built so far
+        # Frames: [name, remaining dependencies, dependency info so far, saw a cycle]
+        stack: List[List[Any]] = []
+
+        def open_frame(name: str) -> None:
+            on_path.add(name)
+            stack.append([name, iter(self._defs[self._index[name]].dependencies), {}, False])
+
+        open_frame(variable_name)
+        while True:
+            frame = stack[-1]
+            name, deps, dependencies_info, _ = frame
+            for dep_name in deps:
+                if dep_name in ds_variables:
+                    dependencies_info[dep_name] = {"status": "base_variable_in_dataset"}
+                elif dep_name in self._index:
+                    if not recursive:
+                        dependencies_info[dep_name] = {"status": "derived_variable"}
+                    elif dep_name in on_path:
+                        dependencies_info[dep_name] = {"status": "derived_variable", "dependencies": {"status": "cycle_detected"}}
+                        frame[3] = True
+                    elif dep_name in reports:
+                        dependencies_info[dep_name] = {"status": "derived_variable", "dependencies": reports[dep_name]}
+                    else:
+                        open_frame(dep_name) # Resumes this frame's iterator once the dependency is done
+                        break
+                elif ds:
+                    dependencies_info[dep_name] = {"status": "missing_base_variable"}
                 else:
-                    dependencies_info[dep_name] = {"status": "derived_variable"}
-            elif ds:
-                 dependencies_info[dep_name] = {"status": "missing_base_variable"}
+                    dependencies_info[dep_name] = {"status": "unknown_or_missing_base_variable"}
             else:
-                 dependencies_info[dep_name] = {"status": "unknown_or_missing_base_variable"}
-        _resolving_stack.remove(variable_name)
-        return {
-            "name": variable_name,
-            "description": var_def.description,
-            "dependencies": dependencies_info
-        }
+                stack.pop()
+                on_path.discard(name)
+                report = {"name": name, "description": self._defs[self._index[name]].description, "dependencies": dependencies_info}
+                if not frame[3]:
+                    reports[name] = report
+                if not stack:
+                    return report
+                parent = stack[-1]
+                parent[2][name] = {"status": "derived_variable", "dependencies": report}
+                parent[3] = parent[3] or frame[3]
 
     def get_metadata(self, variable_name: str) -> Optional[Dict[str, Any]]:
         var_def = self.get_variable(variable_name)
@@ -153,8 +510,9 @@ class DerivedVariableRegistry:
             "name": var_def.name,
             "dependencies": var_def.dependencies,
             "description": var_def.description,
-            "attrs": var_def.attrs,
+            "attrs": dict(var_def.attrs),
             "formula_str": var_def.formula_str,
+            "expr": var_def.expr,
             "standard_name": var_def.standard_name,
             "long_name": var_def.long_name,
             "output_dims_hint": var_def.output_dims_hint,
@@ -162,28 +520,36 @@ class DerivedVariableRegistry:
         }
 
     def list_all_computable(self, ds: xr.Dataset) -> List[str]:
-        computable_vars = []
-        for name in self._registry.keys():
-            if self._is_computable(name, ds, resolving_stack=set()):
-                computable_vars.append(name)
-        return sorted(computable_vars)
+        return sorted(var_def.name for var_def in self.iter_computable(ds))
 
     def search_variables(self, keyword: str, search_fields: Optional[List[str]] = None) -> List[Dict[str, Any]]:
-        if search_fields is None:
-            search_fields = ["name", "description", "standard_name", "long_name", "formula_str"]
-        matches = []
+        """Metadata of the variables whose given text fields contain ``keyword``, case-insensitively.
+
+        The lowercased fields are prepared once per registry version, so a query is just
+        substring tests over ready-made strings.
+        """
         keyword_lower = keyword.lower()
-        for var_def in self.list_all():
+        columns = self._columns()
+        if search_fields is None or list(search_fields) == list(_SEARCH_FIELDS):
+            hits = [keyword_lower in text for text in columns.search_text]
+        else:
+            hits = [False] * len(columns.names)
             for field_name in search_fields:
-                field_value = getattr(var_def, field_name, None)
-                if field_value and isinstance(field_value, str) and keyword_lower in field_value.lower():
-                    meta = self.get_metadata(var_def.name)
-                    if meta: matches.append(meta)
-                    break
-        return matches
+                if field_name not in columns.lowered_fields:
+                    columns.lowered_fields[field_name] = tuple(self._lowered_field(v, field_name) for v in self._defs)
+                for row, value in enumerate(columns.lowered_fields[field_name]):
+                    hits[row] = hits[row] or (bool(value) and keyword_lower in value)
+        return [self.get_metadata(name) for name, hit in zip(columns.names, hits) if hit]
+
+    @staticmethod
+    def _lowered_field(var_def: DerivedVariable, field_name: str) -> str:
+        value = getattr(var_def, field_name, None)
+        return value.lower() if value and isinstance(value, str) else ""
 
     def clear(self) -> None:
-        self._registry.clear()
+        self._names.clear(); self._deps.clear(); self._defs.clear()
+        self._index.clear()
+        self._version += 1
 
 registry = DerivedVariableRegistry()
 
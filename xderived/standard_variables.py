@@ -2,18 +2,142 @@
 
 """Standard derived variables for common meteorological calculations."""
 
+import functools
+import math
+import warnings
 import xarray as xr
 import numpy as np
+from typing import Callable, Dict, Optional, Tuple
+from . import config
 from .core import DerivedVariable, registry
+from .utils import dask_array_module
+
+try:
+    import ml_dtypes
+except ImportError: # Only needed for config["precision"] = "bfloat16"
+    ml_dtypes = None
 
 # Constants
+# Plain Python floats on purpose: NumPy treats them as weak scalars, so float32
+# inputs stay float32 (an np.float64 constant would upcast the whole array).
 R_d = 287.058  # J/(kg·K), specific gas constant for dry air
 C_p = 1005.0   # J/(kg·K), specific heat capacity of dry air at constant pressure
 P0 = 100000.0  # Pa, reference pressure
 L_v = 2.501e6  # J/kg, latent heat of vaporization for water
 EPSILON = 0.622 # ratio of molar masses of water vapor to dry air
 
+# Derived constants, folded once here so kernels do scalar work instead of extra array passes
+_KAPPA = R_d / C_p # Poisson exponent
+_P0_KAPPA = P0 ** _KAPPA # theta = T * (P0 / p)**kappa = T * P0**kappa * p**-kappa: no array division
+_LV_OVER_CP = L_v / C_p
+# Tetens: 610.78 * exp(17.27 * Tc / (Tc + 237.3)), Tc = T - 273.15. Since Tc / (Tc + 237.3) = 1 - 237.3 / (T - 35.85),
+# es = exp(_TETENS_OFFSET + _TETENS_SCALE / (T - 35.85)), with the 610.78 factor folded into the exponent
+_TETENS_SHIFT = 273.15 - 237.3
+_TETENS_SCALE = -17.27 * 237.3
+_TETENS_OFFSET = 17.27 + math.log(610.78)
+
+# Storage dtypes selectable with config["precision"]; kernels still compute in float32 buffers
+_PRECISION_DTYPES = {"float32": np.dtype(np.float32)}
+if ml_dtypes is not None:
+    _PRECISION_DTYPES["bfloat16"] = np.dtype(ml_dtypes.bfloat16)
+
 # --- Helper functions (if any, or define within lambdas/functions below) ---
+# Elementwise kernels are applied with _apply_kernel (xr.apply_ufunc + dask blockwise) so that
+# Dask-backed inputs run them block by block, in parallel, without rechunking.
+
+def _empty_result(*arrays: np.ndarray) -> np.ndarray:
+    """Uninitialized output buffer for an elementwise kernel over ``arrays`` (float32 or wider)."""
+    shape = np.broadcast_shapes(*(np.shape(a) for a in arrays))
+    return np.empty(shape, dtype=np.result_type(*arrays, np.float32))
+
+def _storage_inputs(*inputs: xr.DataArray) -> Tuple[np.dtype, Tuple[xr.DataArray, ...]]:
+    """Result dtype for a kernel over ``inputs``, and the inputs cast to config["precision"] if set."""
+    precision = config.config.get("precision")
+    if precision is None:
+        return np.result_type(*(da.dtype for da in inputs), np.float32), inputs
+    if precision not in _PRECISION_DTYPES:
+        hint = " (install ml_dtypes for bfloat16)" if precision == "bfloat16" else ""
+        raise ValueError(f"Unsupported precision \"{precision}\"{hint}. Use one of {sorted(_PRECISION_DTYPES)} or None.")
+    dtype = _PRECISION_DTYPES[precision]
+    return dtype, tuple(da.astype(dtype, copy=False) for da in inputs)
+
+def _apply_kernel(kernel: Callable[..., np.ndarray], *inputs: xr.DataArray) -> xr.DataArray:
+    """Run a NumPy kernel over DataArrays; for Dask inputs it becomes one blockwise graph layer."""
+    dtype, inputs = _storage_inputs(*inputs)
+
+    kernel = _backend_kernel(kernel)
+
+    def block(*arrays):
+        return kernel(*arrays).astype(dtype, copy=False)
+
+    def run(*arrays):
+        # blockwise rather than dask="parallelized": the gufunc path wraps the
+        # kernel in extra getitem/transpose layers that block-level fusion can't see through.
+        dask_array = dask_array_module()
+        if dask_array is not None and any(isinstance(a, dask_array.Array) for a in arrays):
+            index = tuple(range(max(np.ndim(a) for a in arrays)))
+            pairs = [x for a in arrays for x in (a, index[len(index) - np.ndim(a):])]
+            return dask_array.blockwise(block, index, *pairs, dtype=dtype)
+        return block(*arrays)
+
+    # Inputs' attrs (units etc.) don't describe the result; the accessor stamps the definition's attrs
+    return xr.apply_ufunc(run, *inputs, dask="allowed", keep_attrs=False)
+
+@functools.lru_cache(maxsize=None)
+def _jax_kernels() -> Dict[Callable, Callable]:
+    """``jax.jit`` versions of the NumPy kernels that have one, keyed by the NumPy kernel.
+
+    Pure formulas (XLA fuses them, so no in-place tricks are needed); jax is imported on first use.
+    """
+    import jax
+    import jax.numpy as jnp
+
+    def wind_values(u, v):
+        speed = jnp.hypot(u, v)
+        direction = jnp.degrees(jnp.arctan2(u, v)) + 180
+        return speed, jnp.where(speed == 0, 270, jnp.where(direction >= 360, 0, direction))
+
+    return {
+        _potential_temperature_values: jax.jit(lambda temp_k, pressure_pa: temp_k * _P0_KAPPA * pressure_pa ** -_KAPPA),
+        _saturation_vapor_pressure_values: jax.jit(lambda temp_k: jnp.exp(_TETENS_OFFSET + _TETENS_SCALE / (temp_k - _TETENS_SHIFT))),
+        _equivalent_potential_temperature_values: jax.jit(lambda theta, w, temp_k: theta * jnp.exp(_LV_OVER_CP * w / temp_k)),
+        _wind_values: jax.jit(wind_values),
+    }
+
+def _backend_kernel(kernel: Callable[..., np.ndarray]) -> Callable[..., np.ndarray]:
+    """``kernel``, or its JAX version when config["backend"] is "jax"; returns NumPy arrays either way."""
+    backend = config.config.get("backend", "numpy")
+    if backend == "numpy":
+        return kernel
+    if backend != "jax":
+        raise ValueError(f"Unsupported backend \"{backend}\". Use \"numpy\" or \"jax\".")
+    try:
+        jax_kernel = _jax_kernels().get(kernel)
+        import jax
+    except ImportError:
+        raise ValueError("Backend \"jax\" needs jax (pip install jax).") from None
+    if jax_kernel is None: # No JAX version; stays on NumPy
+        return kernel
+
+    def run(*arrays):
+        dtype = np.result_type(*arrays, np.float32) # What the NumPy kernel would return
+        if dtype == np.float64 and jax.dtypes.canonicalize_dtype(np.float64) != np.float64: # x64 disabled
+            warnings.warn("Backend \"jax\" computes float64 inputs in float32 unless jax_enable_x64 is set; "
+                          "results are cast back to float64.", RuntimeWarning, stacklevel=2)
+        outputs = jax_kernel(*arrays)
+        # Writable copies (JAX buffers are read-only) in the input precision, not JAX's default float32
+        if isinstance(outputs, tuple):
+            return tuple(np.array(out, dtype=dtype) for out in outputs)
+        return np.array(outputs, dtype=dtype)
+
+    return run
+
+# Kernels below fill one output buffer in place instead of allocating a temporary per operator
+def _potential_temperature_values(temp_k: np.ndarray, pressure_pa: np.ndarray) -> np.ndarray:
+    out = _empty_result(temp_k, pressure_pa)
+    np.power(pressure_pa, -_KAPPA, out=out)
+    np.multiply(out, _P0_KAPPA, out=out)
+    return np.multiply(temp_k, out, out=out)
 
 # --- Variable Definitions ---
 
@@ -21,101 +145,155 @@ def calculate_potential_temperature(ds: xr.Dataset) -> xr.DataArray:
     """Calculate Potential Temperature (theta)."""
     temp_k = ds["air_temperature"]
     pressure_pa = ds["air_pressure"]
-    theta = temp_k * (P0 / pressure_pa)**(R_d / C_p)
-    theta.attrs = {
-        "units": "K",
-        "long_name": "Air Potential Temperature",
-        "standard_name": "air_potential_temperature"
-    }
+    theta = _apply_kernel(_potential_temperature_values, temp_k, pressure_pa)
     return theta
 
-def calculate_wind_speed(ds: xr.Dataset) -> xr.DataArray:
-    """Calculate Wind Speed from u and v components."""
+def _wind_values(u: np.ndarray, v: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    speed = np.hypot(u, v)
+    # Direction the wind blows from, clockwise from north: (270 - deg(atan2(v, u))) mod 360,
+    # which equals deg(atan2(u, v)) + 180 and needs no (slow) float remainder
+    direction = np.arctan2(u, v)
+    np.rad2deg(direction, out=direction)
+    np.add(direction, 180, out=direction)
+    direction[direction >= 360] = 0 # atan2(+0, v < 0) is exactly pi: a northerly, 0 rather than 360
+    direction[np.broadcast_to(speed == 0, direction.shape)] = 270 # Calm: 270, as (270 - atan2(0, 0)) mod 360 gives
+    return speed, direction
+
+def calculate_wind(ds: xr.Dataset) -> xr.Dataset:
+    """Calculate Wind Speed and Wind From Direction together, in one call over u and v."""
     u = ds["eastward_wind"]
     v = ds["northward_wind"]
-    speed = np.sqrt(u**2 + v**2)
-    speed.attrs = {
-        "units": getattr(u, "units", "m s-1"), # Preserve units if possible
-        "long_name": "Wind Speed",
-        "standard_name": "wind_speed"
-    }
-    return speed
+    dtype, (u_in, v_in) = _storage_inputs(u, v)
+    kernel = _backend_kernel(_wind_values)
+
+    def wind_values(u, v):
+        work = np.result_type(u, v, np.float32) # bfloat16 storage is widened for the arithmetic
+        speed, direction = kernel(u.astype(work, copy=False), v.astype(work, copy=False))
+        return speed.astype(dtype, copy=False), direction.astype(dtype, copy=False)
+
+    speed, direction = xr.apply_ufunc(
+        wind_values, u_in, v_in,
+        output_core_dims=[[], []], dask="parallelized", output_dtypes=[dtype, dtype], keep_attrs=False
+    )
+    if "units" in u.attrs: # Speed is in the components' units; the definition's attrs fill in the rest
+        speed.attrs["units"] = u.attrs["units"]
+    return xr.Dataset({"wind_speed": speed, "wind_from_direction": direction})
+
+def calculate_wind_speed(ds: xr.Dataset) -> xr.DataArray:
+    """Calculate Wind Speed from u and v components."""
+    return calculate_wind(ds)["wind_speed"]
 
 def calculate_wind_from_direction(ds: xr.Dataset) -> xr.DataArray:
     """Calculate Wind From Direction from u and v components."""
-    u = ds["eastward_wind"]
-    v = ds["northward_wind"]
-    direction = (270 - np.rad2deg(np.arctan2(v, u))) % 360
-    direction.attrs = {
-        "units": "degree",
-        "long_name": "Wind From Direction",
-        "standard_name": "wind_from_direction"
-    }
-    return direction
+    return calculate_wind(ds)["wind_from_direction"]
 
 # --- Phase 2: Chainable and Discoverable Variables ---
 
+def _saturation_vapor_pressure_values(temp_k: np.ndarray) -> np.ndarray:
+    out = _empty_result(temp_k)
+    np.subtract(temp_k, _TETENS_SHIFT, out=out) # Tc + 237.3
+    np.divide(_TETENS_SCALE, out, out=out)
+    np.add(out, _TETENS_OFFSET, out=out)
+    return np.exp(out, out=out)
+
 def calculate_saturation_vapor_pressure_tetens(ds: xr.Dataset) -> xr.DataArray:
     """Calculate saturation vapor pressure using Tetens' formula."""
-    temp_k = ds["air_temperature"]
-    temp_c = temp_k - 273.15
-    temp_c.attrs["units"] = "degC" # For clarity in formula application
     # Tetens' formula: es(T) = 0.61078 * exp((17.27 * T_c) / (T_c + 237.3)) (es in kPa)
     # Convert to Pa: es_Pa = 1000 * 0.61078 * exp((17.27 * T_c) / (T_c + 237.3))
-    es_pa = 610.78 * np.exp((17.27 * temp_c) / (temp_c + 237.3))
-    es_pa.attrs = {
-        "units": "Pa",
-        "long_name": "Saturation Vapor Pressure (Tetens)",
-        "standard_name": "saturation_vapor_pressure"
-    }
+    es_pa = _apply_kernel(_saturation_vapor_pressure_values, ds["air_temperature"])
     return es_pa
 
+def _saturation_mixing_ratio_values(pressure_pa: np.ndarray, es_pa: np.ndarray) -> np.ndarray:
+    out = _empty_result(pressure_pa, es_pa)
+    np.subtract(pressure_pa, es_pa, out=out)
+    out[out <= 0] = np.nan # p - es should be positive; anything else is undefined
+    np.divide(es_pa, out, out=out)
+    return np.multiply(out, EPSILON, out=out)
+
 def calculate_saturation_mixing_ratio(ds: xr.Dataset) -> xr.DataArray:
     """Calculate saturation mixing ratio."""
-    pressure_pa = ds["air_pressure"]
-    # Dependency on another derived variable
-    es_pa = ds["saturation_vapor_pressure_tetens"] 
-    # ws = epsilon * es / (p - es)
-    # Ensure p - es is not zero or negative, though physically p should be > es
-    denominator = xr.where(pressure_pa - es_pa <= 0, np.nan, pressure_pa - es_pa)
-    ws = (EPSILON * es_pa) / denominator
-    ws.attrs = {
-        "units": "kg kg-1",
-        "long_name": "Saturation Mixing Ratio",
-        "standard_name": "saturation_mixing_ratio"
-    }
+    # ws = epsilon * es / (p - es), with es from another derived variable
+    ws = _apply_kernel(_saturation_mixing_ratio_values, ds["air_pressure"], ds["saturation_vapor_pressure_tetens"])
     return ws
 
+def _mixing_ratio_values(q: np.ndarray) -> np.ndarray:
+    out = _empty_result(q)
+    np.subtract(1, q, out=out)
+    out[out <= 0] = np.nan # Ensure 1 - q is not zero
+    return np.divide(q, out, out=out)
+
 def calculate_mixing_ratio_from_specific_humidity(ds: xr.Dataset) -> xr.DataArray:
     """Calculate mixing ratio from specific humidity."""
-    q = ds["specific_humidity"]
     # w = q / (1 - q)
-    # Ensure 1 - q is not zero
-    denominator = xr.where(1 - q <= 0, np.nan, 1 - q)
-    w = q / denominator
-    w.attrs = {
-        "units": "kg kg-1",
-        "long_name": "Mixing Ratio (from Specific Humidity)",
-        "standard_name": "humidity_mixing_ratio"
-    }
+    w = _apply_kernel(_mixing_ratio_values, ds["specific_humidity"])
     return w
 
+def _relative_humidity_values(w: np.ndarray, ws: np.ndarray) -> np.ndarray:
+    out = _empty_result(w, ws)
+    with np.errstate(divide="ignore", invalid="ignore"): # ws <= 0 slots are set to NaN below
+        np.divide(w, ws, out=out)
+    np.multiply(out, 100, out=out)
+    out[np.broadcast_to(ws <= 0, out.shape)] = np.nan # Ensure ws is not zero
+    return np.clip(out, 0, 100, out=out) # RH should be between 0 and 100
+
 def calculate_relative_humidity_from_mixing_ratios(ds: xr.Dataset) -> xr.DataArray:
     """Calculate relative humidity from mixing ratio and saturation mixing ratio."""
-    # Dependencies on other derived variables
-    w = ds["mixing_ratio_from_specific_humidity"]
-    ws = ds["saturation_mixing_ratio"]
-    # RH = (w / ws) * 100
-    # Ensure ws is not zero
-    rh = xr.where(ws <= 0, np.nan, (w / ws) * 100)
-    rh = rh.clip(0, 100) # RH should be between 0 and 100
-    rh.attrs = {
-        "units": "%",
-        "long_name": "Relative Humidity (from Mixing Ratios)",
-        "standard_name": "relative_humidity"
-    }
+    # RH = (w / ws) * 100, both from other derived variables
+    rh = _apply_kernel(_relative_humidity_values, ds["mixing_ratio_from_specific_humidity"], ds["saturation_mixing_ratio"])
     return rh
 
+@functools.lru_cache(maxsize=None)
+def _numba_relative_humidity_kernel() -> Optional[Callable[..., np.ndarray]]:
+    """Compiled one-pass RH loop, or None without numba. Built on first use: numba is slow to import.
+
+    Unlike exp/pow, whose NumPy float32 versions are SIMD and beat a scalar loop, this is
+    divisions and compares, which numba vectorizes; the one loop replaces three kernels'
+    worth of passes and masks. ``nogil`` lets Dask's threads run blocks in parallel;
+    ``cache`` keeps the machine code in ``__pycache__`` so later sessions skip compilation.
+    """
+    try:
+        import numba
+    except ImportError:
+        return None
+
+    # fastmath without the no-NaN/no-inf assumptions: NaN inputs and outputs are meaningful here
+    @numba.njit(fastmath={"nsz", "arcp", "contract", "afn", "reassoc"}, nogil=True, cache=True)
+    def kernel(q, pressure_pa, es_pa, out, scale):
+        for i in range(out.size):
+            dry = 1 - q[i]
+            excess = pressure_pa[i] - es_pa[i]
+            if dry <= 0 or excess <= 0 or es_pa[i] <= 0:
+                out[i] = np.nan
+            else: # 100 * w / ws = 100 / epsilon * q (p - es) / ((1 - q) es), clipped to [0, 100]
+                out[i] = min(max(scale * q[i] * excess / (dry * es_pa[i]), 0), 100)
+        return out
+
+    return kernel
+
+def _relative_humidity_fused_values(q: np.ndarray, pressure_pa: np.ndarray, es_pa: np.ndarray) -> np.ndarray:
+    kernel = _numba_relative_humidity_kernel()
+    if kernel is None: # The chained kernels, in one call
+        return _relative_humidity_values(_mixing_ratio_values(q), _saturation_mixing_ratio_values(pressure_pa, es_pa))
+    out = _empty_result(q, pressure_pa, es_pa)
+    # Views unless broadcasting or widening (e.g. bfloat16 storage, which numba can't compile for); read-only
+    # broadcast_to views, as numba reading a broadcast_arrays view's writeable flag raises a FutureWarning
+    flat = [np.ravel(np.broadcast_to(a, out.shape)).astype(out.dtype, copy=False) for a in (q, pressure_pa, es_pa)]
+    kernel(*flat, out.reshape(-1), out.dtype.type(100 / EPSILON))
+    return out
+
+def calculate_relative_humidity_fused(ds: xr.Dataset) -> xr.DataArray:
+    """Calculate relative humidity directly from specific humidity, pressure and saturation vapor pressure."""
+    # Same result as relative_humidity_from_mixing_ratios, without the two intermediate variables
+    rh = _apply_kernel(_relative_humidity_fused_values, ds["specific_humidity"], ds["air_pressure"], ds["saturation_vapor_pressure_tetens"])
+    return rh
+
+def _equivalent_potential_temperature_values(theta: np.ndarray, w: np.ndarray, temp_k: np.ndarray) -> np.ndarray:
+    out = _empty_result(theta, w, temp_k)
+    np.multiply(_LV_OVER_CP, w, out=out)
+    np.divide(out, temp_k, out=out)
+    np.exp(out, out=out)
+    return np.multiply(theta, out, out=out)
+
 def calculate_equivalent_potential_temperature_approx(ds: xr.Dataset) -> xr.DataArray:
     """Calculate Equivalent Potential Temperature (approximate formula)."""
     # Dependencies on other derived variables and base variables
@@ -126,16 +304,12 @@ def calculate_equivalent_potential_temperature_approx(ds: xr.Dataset) -> xr.Data
     # θ_e ≈ θ * exp((L_v * w) / (c_p * T_k))
     # Using T_k as the surface temperature for approximation, common in some contexts.
     # More accurate calculations would use temperature at LCL, which is more complex.
-    theta_e = theta * np.exp((L_v * w) / (C_p * temp_k))
-    theta_e.attrs = {
-        "units": "K",
-        "long_name": "Equivalent Potential Temperature (Approximate)",
-        "standard_name": "equivalent_potential_temperature"
-    }
+    theta_e = _apply_kernel(_equivalent_potential_temperature_values, theta, w, temp_k)
     return theta_e
 
 
 # List of all standard variable definitions
+# All are per-cell kernels (elementwise=True), so ds.derived.point may slice their inputs first
 # Phase 1 variables
 PT_DEF = DerivedVariable(
     name="potential_temperature",
@@ -143,25 +317,28 @@ PT_DEF = DerivedVariable(
     func=calculate_potential_temperature,
     description="Air Potential Temperature calculated using temperature and pressure.",
     attrs={"units": "K", "long_name": "Air Potential Temperature", "standard_name": "air_potential_temperature"},
-    formula_str="T * (P0 / P)^(R_d / C_p)"
+    formula_str="T * (P0 / P)^(R_d / C_p)",
+    elementwise=True
 )
 
 WS_DEF = DerivedVariable(
     name="wind_speed",
     dependencies=["eastward_wind", "northward_wind"],
-    func=calculate_wind_speed,
+    func=calculate_wind, # Shared with WD_DEF: computing either variable caches both
     description="Wind Speed calculated from u and v components.",
     attrs={"units": "m s-1", "long_name": "Wind Speed", "standard_name": "wind_speed"},
-    formula_str="sqrt(u^2 + v^2)"
+    formula_str="sqrt(u^2 + v^2)",
+    elementwise=True
 )
 
 WD_DEF = DerivedVariable(
     name="wind_from_direction",
     dependencies=["eastward_wind", "northward_wind"],
-    func=calculate_wind_from_direction,
+    func=calculate_wind,
     description="Wind From Direction calculated from u and v components.",
     attrs={"units": "degree", "long_name": "Wind From Direction", "standard_name": "wind_from_direction"},
-    formula_str="(270 - atan2(v, u) * 180/pi) % 360"
+    formula_str="atan2(u, v) * 180/pi + 180 (0 for northerlies, 270 for calm)",
+    elementwise=True
 )
 
 # Phase 2 variables (demonstrating chaining)
@@ -171,7 +348,8 @@ SAT_VP_DEF = DerivedVariable(
     func=calculate_saturation_vapor_pressure_tetens,
     description="Saturation vapor pressure using Tetens' formula.",
     attrs={"units": "Pa", "long_name": "Saturation Vapor Pressure (Tetens)", "standard_name": "saturation_vapor_pressure"},
-    formula_str="610.78 * exp((17.27 * (T_k - 273.15)) / ((T_k - 273.15) + 237.3))"
+    formula_str="610.78 * exp((17.27 * (T_k - 273.15)) / ((T_k - 273.15) + 237.3))",
+    elementwise=True
 )
 
 MIX_RATIO_SPEC_HUM_DEF = DerivedVariable(
@@ -180,7 +358,8 @@ MIX_RATIO_SPEC_HUM_DEF = DerivedVariable(
     func=calculate_mixing_ratio_from_specific_humidity,
     description="Mixing ratio calculated from specific humidity.",
     attrs={"units": "kg kg-1", "long_name": "Mixing Ratio (from Specific Humidity)", "standard_name": "humidity_mixing_ratio"},
-    formula_str="q / (1 - q)"
+    formula_str="q / (1 - q)",
+    elementwise=True
 )
 
 SAT_MIX_RATIO_DEF = DerivedVariable(
@@ -189,7 +368,8 @@ SAT_MIX_RATIO_DEF = DerivedVariable(
     func=calculate_saturation_mixing_ratio,
     description="Saturation mixing ratio.",
     attrs={"units": "kg kg-1", "long_name": "Saturation Mixing Ratio", "standard_name": "saturation_mixing_ratio"},
-    formula_str="(0.622 * es_tetens) / (P - es_tetens)"
+    formula_str="(0.622 * es_tetens) / (P - es_tetens)",
+    elementwise=True
 )
 
 RH_MIX_RATIO_DEF = DerivedVariable(
@@ -198,7 +378,18 @@ RH_MIX_RATIO_DEF = DerivedVariable(
     func=calculate_relative_humidity_from_mixing_ratios,
     description="Relative humidity from mixing ratio and saturation mixing ratio.",
     attrs={"units": "%", "long_name": "Relative Humidity (from Mixing Ratios)", "standard_name": "relative_humidity"},
-    formula_str="(w / ws) * 100"
+    formula_str="(w / ws) * 100",
+    elementwise=True
+)
+
+RH_FUSED_DEF = DerivedVariable(
+    name="relative_humidity_fused",
+    dependencies=["specific_humidity", "air_pressure", "saturation_vapor_pressure_tetens"],
+    func=calculate_relative_humidity_fused,
+    description="Relative humidity from specific humidity, pressure and saturation vapor pressure, in one pass.",
+    attrs={"units": "%", "long_name": "Relative Humidity", "standard_name": "relative_humidity"},
+    formula_str="100 * (q / (1 - q)) / (0.622 * es_tetens / (P - es_tetens))",
+    elementwise=True
 )
 
 THETA_E_APPROX_DEF = DerivedVariable(
@@ -207,7 +398,8 @@ THETA_E_APPROX_DEF = DerivedVariable(
     func=calculate_equivalent_potential_temperature_approx,
     description="Equivalent Potential Temperature (approximate).",
     attrs={"units": "K", "long_name": "Equivalent Potential Temperature (Approximate)", "standard_name": "equivalent_potential_temperature"},
-    formula_str="theta * exp((Lv * w) / (Cp * T_k))"
+    formula_str="theta * exp((Lv * w) / (Cp * T_k))",
+    elementwise=True
 )
 
 
@@ -228,16 +420,13 @@ def register_standard_variables():
         MIX_RATIO_SPEC_HUM_DEF,
         SAT_MIX_RATIO_DEF,
         RH_MIX_RATIO_DEF,
+        RH_FUSED_DEF,
         THETA_E_APPROX_DEF
     ]
-    for var_def in standard_vars:
-        try:
-            registry.register(var_def)
-        except registry.RegistrationError: # Use fully qualified name for the exception type
-            # Variable might already be registered (e.g., if this function is called multiple times without clearing)
-            # For now, we can choose to ignore this or print a warning.
-            # print(f"Warning: Variable {var_def.name} already registered. Skipping.")
-            pass # Silently skip if already registered
+    # Skip names already taken (a re-import, or a user's own definition); the rest go in as one batch
+    missing = [var_def for var_def in standard_vars if var_def.name not in registry]
+    if missing:
+        registry.register_many(missing)
 
 # Call registration when this module is imported (optional, depends on desired behavior)
 # register_standard_variables() 
@@ -2,15 +2,25 @@
 
 """Utility functions and custom error classes for the xderived plugin."""
 
+import sys
+
 class MissingDependencyError(AttributeError):
     """Custom error for when a derived variable dependency is missing."""
-    pass
+    __slots__ = ()
 
 class ComputationError(RuntimeError):
     """Custom error for failures during derived variable computation."""
-    pass
+    __slots__ = ()
 
 class RegistrationError(ValueError):
     """Custom error for issues during derived variable registration."""
-    pass
+    __slots__ = ()
+
+
+def dask_array_module():
+    """Return ``dask.array`` if it has already been imported, else None.
 
+    A Dask array cannot exist before ``dask.array`` is imported, so type checks can use
+    this without paying for the (slow) Dask import themselves.
+    """
+    return sys.modules.get("dask.array")